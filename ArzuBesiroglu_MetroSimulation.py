@@ -3,11 +3,13 @@
 # BFS ve A* algoritmaları ile rota optimizasyonu
 
 # Gerekli kütüphaneleri içe aktar
+import bisect
 import logging
+import os
+import sys
 from collections import defaultdict, deque
 import heapq
-import time
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 
 # Terminalde renkli çıktı için ANSI renk kodları
 RENKLER = {
@@ -17,115 +19,1100 @@ RENKLER = {
     "Varsayılan":  "\033[0m"     # Renk sıfırlama
 }
 
-# Loglama ayarları
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+def loglama_kur(seviye=logging.INFO):
+    """Etkileşimli mod için loglama ayarları (toplu modda hiç çağrılmaz)."""
+    logging.basicConfig(level=seviye, format='[%(levelname)s] %(message)s')
 
 class Istasyon:
     """
     Metro istasyonlarını temsil eden sınıf.
     Her istasyonun bir ID'si, adı ve bağlı olduğu hattı vardır.
     Aynı isimde birden fazla istasyon (aktarma) olabilir.
+    Konum (enlem/boylam, derece) isteğe bağlıdır.
     """
-    def __init__(self, idx: str, ad: str, hat: str):
+    __slots__ = ('idx', 'ad', 'hat', 'enlem', 'boylam', 'komsular', 'kenar_idleri')
+
+    def __init__(self, idx: str, ad: str, hat: str, enlem: Optional[float] = None, boylam: Optional[float] = None):
         self.idx = idx
         self.ad = ad
         self.hat = hat
+        self.enlem = enlem
+        self.boylam = boylam
         self.komsular: List[Tuple['Istasyon', int]] = []  # (komşu istasyon, süre) tuple'ları
+        self.kenar_idleri: List[int] = []  # komsular ile aynı sırada bağlantı ID'leri
 
-    def komsu_ekle(self, istasyon, sure):
-        """İstasyona bir komşu bağlantısı ekler."""
+    def komsu_ekle(self, istasyon, sure, kid=-1) -> int:
+        """İstasyona bir komşu bağlantısı ekler; komsular içindeki konumunu döndürür."""
         self.komsular.append((istasyon, sure))
+        self.kenar_idleri.append(kid)
+        return len(self.komsular) - 1
+
+    def komsu_cikar(self, pos) -> Optional[int]:
+        """
+        Konumdaki komşuyu O(1) çıkarır (son eleman boşluğa taşınır).
+        Taşınan bağlantının ID'sini döndürür (taşınan yoksa None); konum kaydı çağıranındır.
+        """
+        son = len(self.komsular) - 1
+        tasinan = None
+        if pos != son:
+            self.komsular[pos] = self.komsular[son]
+            self.kenar_idleri[pos] = tasinan = self.kenar_idleri[son]
+        self.komsular.pop()
+        self.kenar_idleri.pop()
+        return tasinan
+
+    def komsu_sure_guncelle(self, pos, sure):
+        """Konumdaki komşunun süresini yerinde O(1) günceller."""
+        self.komsular[pos] = (self.komsular[pos][0], sure)
 
     def renkli_ad(self):
         """Hattına göre renkli istasyon adı döndürür."""
         return f"{RENKLER.get(self.hat)}{self.ad}{RENKLER['Varsayılan']}"
 
+class Baglanti:
+    """
+    İki istasyon arasındaki çift yönlü bağlantı kaydı.
+    Kapalı bağlantılar komşu listelerinden çıkarılır, kayıt ise saklanır.
+    k1/k2: bağlantının i1 ve i2 komşu listelerindeki konumu (kapalıyken -1).
+    """
+    __slots__ = ('kid', 'i1', 'i2', 'sure', 'acik', 'k1', 'k2')
+
+    def __init__(self, kid: int, i1: Istasyon, i2: Istasyon, sure: int):
+        self.kid = kid
+        self.i1 = i1
+        self.i2 = i2
+        self.sure = sure
+        self.acik = True
+        self.k1 = self.k2 = -1
+
 class MetroAgi:
     """
     Metro ağını grafik olarak modelleyen sınıf.
     İstasyonları ve aralarındaki bağlantıları yönetir.
     """
-    def __init__(self):
+    def __init__(self, onbellek_boyutu=1024):
         self.istasyonlar: Dict[str, List[Istasyon]] = defaultdict(list)  # istasyon adı -> istasyon nesneleri
+        self._id_index: Dict[str, Istasyon] = {}  # istasyon ID -> istasyon nesnesi (O(1) erişim)
         self._count = 0  # A* için eşit maliyetlerde öncelik belirlemek amacıyla sayaç
+        # Bağlı bileşen indeksi (union-find): istasyon -> ebeveyn, istasyon -> rank.
+        # Eklenen/açılan her bağlantıyla birleşir; kapanışlar indeksi değiştirmez.
+        self._ebeveyn: Dict[Istasyon, Istasyon] = {}
+        self._rank: Dict[Istasyon, int] = {}
+        self.baglantilar: List[Baglanti] = []  # bağlantı ID -> bağlantı kaydı
+        # Anahtarlı bağlantı deposu: istasyon çifti (sıralı ID ikilisi) başına tek bağlantı (en kısa süreli)
+        self._ciftler: Dict[Tuple[str, str], int] = {}
+        self._birlesen: List[Tuple[str, str, int, int]] = []  # (id1, id2, tutulan, atılan süre)
+        self._donguler: List[Tuple[str, int]] = []  # atlanan kendine bağlantılar: (id, süre)
+        # Değişiklik dinleyicileri: f(baglanti, eski_sure, yeni_sure); None = kapalı
+        self._dinleyiciler: List[Callable[[Baglanti, Optional[int], Optional[int]], None]] = []
+        # En hızlı rota önbelleği: (bas, hedef) -> (rota, süre, kullanılan bağlantı ID'leri)
+        self._dizin = None  # istasyon adı arama dizini (ilk kullanımda kurulur)
+        self._mekan = None  # koordinat ızgara dizini (ilk kullanımda kurulur)
+        # A* sezgiseli için en yüksek hız (km/dk); None = hesaplanmadı, 0 = sezgisel kapalı
+        self._hiz_siniri: Optional[float] = None
+        # Hat indeksi (önek toplamları) ve hat seviyesi aktarma grafı; yapısal değişiklikte None
+        self._hat_indeksi: Optional[Dict[str, HatIndeksi]] = None
+        self._hat_konumu: Dict[Istasyon, Tuple[HatIndeksi, int]] = {}
+        self._aktarma_grafi: Dict[Istasyon, List[Tuple[Istasyon, Optional[HatIndeksi], int]]] = {}
+        self._tum_hatlar_dogrusal = True
+        self._rota_onbellegi: Dict[Tuple[Istasyon, Istasyon], Tuple[Tuple[Istasyon, ...], int, Tuple[int, ...]]] = {}
+        self.onbellek_boyutu = onbellek_boyutu
+        # En kısa yol ağacı önbelleği: kök -> (mesafe, kök yönündeki sonraki istasyon)
+        self._agac_onbellegi: Dict[Istasyon, Tuple[Dict[Istasyon, int], Dict[Istasyon, Optional[Istasyon]]]] = {}
+        # Profilleme yalnızca istenirse açılır; kapalıyken hiçbir metot sarılmaz
+        if os.environ.get('METRO_PROFIL'):
+            self.profillemeyi_ac(os.environ['METRO_PROFIL'])
+
+    def profillemeyi_ac(self, klasor='profil'):
+        """Yükleme ve sorgu metotlarını cProfile + tracemalloc ile sarar; çıkışta rapor yazılır."""
+        from metro_profil import surec_profilcisi
+        profilci = surec_profilcisi(klasor)
+        profilci.sar(self)
+        return profilci
 
-    def istasyon_ekle(self, idx, ad, hat):
-        """Ağa yeni bir istasyon ekler."""
-        ist = Istasyon(idx, ad, hat)
+    def istasyon_ekle(self, idx, ad, hat, enlem=None, boylam=None):
+        """Ağa yeni bir istasyon ekler (konum isteğe bağlı)."""
+        ist = Istasyon(idx, ad, hat, enlem, boylam)
         self.istasyonlar[ad].append(ist)
+        self._id_index[idx] = ist
+        self._dizin = None
+        self._mekan = None
+        self._hiz_siniri = None
+        self._ebeveyn[ist] = ist
+        self._rank[ist] = 0
         logging.info(f"İstasyon eklendi: {ist.renkli_ad()} ({hat})")
 
-    def baglanti_ekle(self, id1, id2, sure):
-        """İki istasyon arasında çift yönlü bağlantı ekler."""
-        tum = sum(self.istasyonlar.values(), [])  # tüm istasyon nesneleri düz listede
-        i1 = next(i for i in tum if i.idx == id1)
-        i2 = next(i for i in tum if i.idx == id2)
-        i1.komsu_ekle(i2, sure)
-        i2.komsu_ekle(i1, sure)
+    def istasyon_bul(self, idx) -> Istasyon:
+        """ID'si verilen istasyon nesnesini döndürür."""
+        return self._id_index[idx]
+
+    def istasyon_sayisi(self) -> int:
+        """Kayıtlı istasyon sayısı (istasyonlar yalnızca eklenebildiği için sürüm gibi kullanılabilir)."""
+        return len(self._id_index)
+
+    def istasyon_dizini(self):
+        """İstasyon adı arama dizinini (trie + üçlü) döndürür; istasyon eklenene kadar önbellekli."""
+        if self._dizin is None:
+            from metro_arama import IstasyonDizini
+            self._dizin = IstasyonDizini(self.istasyonlar.keys())
+        return self._dizin
+
+    def mekan_dizini(self):
+        """Koordinatlı istasyonların ızgara dizinini döndürür; istasyon eklenene kadar önbellekli."""
+        if self._mekan is None:
+            from metro_mekan import MekanDizini
+            self._mekan = MekanDizini(self._id_index.values())
+        return self._mekan
+
+    def en_yakin_istasyonlar(self, enlem, boylam, k=1) -> List[Tuple[Istasyon, float]]:
+        """Konuma en yakın k istasyonu (istasyon, km) olarak döndürür."""
+        return self.mekan_dizini().en_yakin(enlem, boylam, k)
+
+    def yaricap_icindeki_istasyonlar(self, enlem, boylam, km) -> List[Tuple[Istasyon, float]]:
+        """Konuma en fazla km uzaklıktaki istasyonları (istasyon, km) olarak döndürür."""
+        return self.mekan_dizini().yaricap_icinde(enlem, boylam, km)
+
+    def konumdan_rota_bul(self, enlem1, boylam1, enlem2, boylam2):
+        """İki konuma en yakın istasyonlar arasındaki en hızlı rotayı bulur."""
+        bas = self.en_yakin_istasyonlar(enlem1, boylam1)
+        hedef = self.en_yakin_istasyonlar(enlem2, boylam2)
+        if not bas or not hedef:
+            logging.warning("Konuma yakın koordinatlı istasyon yok")
+            return None
+        return self.en_hizli_rota_bul(bas[0][0], hedef[0][0])
+
+    @staticmethod
+    def _cift_anahtari(id1, id2) -> Tuple[str, str]:
+        """Yönsüz istasyon çifti anahtarı (frozenset'ten küçük, sıralı ikili)."""
+        return (id1, id2) if id1 <= id2 else (id2, id1)
+
+    def baglanti_ekle(self, id1, id2, sure) -> int:
+        """
+        İki istasyon arasında çift yönlü bağlantı ekler ve bağlantı ID'sini döndürür.
+        Aynı çift zaten bağlıysa yeni bağlantı açılmaz: kısa olan süre tutulur, birleştirme
+        kaydedilir ve mevcut ID döner. Kendine bağlantılar atlanır (-1 döner).
+        """
+        i1 = self._id_index[id1]
+        i2 = self._id_index[id2]
+        if i1 is i2:
+            self._donguler.append((id1, sure))
+            logging.warning(f"Kendine bağlantı atlandı: {i1.ad} ({id1})")
+            return -1
+        anahtar = self._cift_anahtari(id1, id2)
+        kid = self._ciftler.get(anahtar)
+        if kid is not None:
+            eski = self.baglantilar[kid].sure
+            self._birlesen.append((id1, id2, min(eski, sure), max(eski, sure)))
+            if sure < eski:
+                self.sure_guncelle(kid, sure)
+            logging.info(f"Tekrarlanan bağlantı birleştirildi: {i1.ad} ↔ {i2.ad} ({min(eski, sure)} dk)")
+            return kid
+        kid = len(self.baglantilar)
+        self._ciftler[anahtar] = kid
+        b = Baglanti(kid, i1, i2, sure)
+        self.baglantilar.append(b)
+        b.k1 = i1.komsu_ekle(i2, sure, kid)
+        b.k2 = i2.komsu_ekle(i1, sure, kid)
+        self._birlestir(i1, i2)
+        self._hat_indeksi = None  # ağ yapısı değişti
+        self._bildir(b, None, sure)
         logging.info(f"Bağlantı: {i1.renkli_ad()} ↔ {i2.renkli_ad()} ({sure} dk)")
+        return kid
+
+    def normallestir(self, aktarma_kumeleri=False, aktarma_suresi=2) -> Dict:
+        """
+        Yükleme sonrası ağ normalleştirme raporu döndürür.
+        Paralel bağlantılar ve kendine bağlantılar baglanti_ekle'de zaten elenir; burada
+        raporlanır. aktarma_kumeleri=True ise aynı adlı, farklı hatlardaki istasyonlar bir
+        aktarma kümesi sayılır ve eksik aktarma bağlantıları eklenir (süre: kümedeki en kısa
+        mevcut aktarma, yoksa aktarma_suresi).
+        """
+        rapor = {
+            'birlesen': list(self._birlesen),
+            'donguler': list(self._donguler),
+            'kumeler': {},
+            'eklenen_aktarmalar': [],
+        }
+        if aktarma_kumeleri:
+            for ad, kume in self.istasyonlar.items():
+                if len({ist.hat for ist in kume}) < 2:
+                    continue
+                rapor['kumeler'][ad] = [ist.idx for ist in kume]
+                ciftler = [(a, b) for i, a in enumerate(kume) for b in kume[i + 1:] if a.hat != b.hat]
+                eksik = []
+                sure = None
+                for a, b in ciftler:
+                    kid = self._ciftler.get(self._cift_anahtari(a.idx, b.idx))
+                    if kid is None:
+                        eksik.append((a, b))
+                    elif sure is None or self.baglantilar[kid].sure < sure:
+                        sure = self.baglantilar[kid].sure
+                if sure is None:
+                    sure = aktarma_suresi
+                for a, b in eksik:
+                    self.baglanti_ekle(a.idx, b.idx, sure)
+                    rapor['eklenen_aktarmalar'].append((a.idx, b.idx, sure))
+        logging.info(f"Normalleştirme: {len(rapor['birlesen'])} paralel bağlantı birleştirildi, "
+                     f"{len(rapor['donguler'])} kendine bağlantı atlandı, "
+                     f"{len(rapor['eklenen_aktarmalar'])} aktarma eklendi")
+        return rapor
+
+    # --- Dinamik bağlantı güncellemeleri (kapanış, açılış, gecikme) ---
+
+    def baglanti_kapat(self, kid):
+        """Bağlantıyı O(1) kapatır; aramalar bu bağlantıyı artık görmez."""
+        b = self.baglantilar[kid]
+        if not b.acik:
+            return
+        b.acik = False
+        for ist, pos in ((b.i1, b.k1), (b.i2, b.k2)):
+            tasinan = ist.komsu_cikar(pos)
+            if tasinan is not None:
+                t = self.baglantilar[tasinan]
+                if t.i1 is ist:
+                    t.k1 = pos
+                else:
+                    t.k2 = pos
+        b.k1 = b.k2 = -1
+        self._bildir(b, b.sure, None)
+        logging.info(f"Bağlantı kapatıldı: {b.i1.ad} ↔ {b.i2.ad}")
+
+    def baglanti_ac(self, kid):
+        """Kapalı bağlantıyı son bilinen süresiyle yeniden açar."""
+        b = self.baglantilar[kid]
+        if b.acik:
+            return
+        b.acik = True
+        b.k1 = b.i1.komsu_ekle(b.i2, b.sure, kid)
+        b.k2 = b.i2.komsu_ekle(b.i1, b.sure, kid)
+        self._birlestir(b.i1, b.i2)
+        self._bildir(b, None, b.sure)
+        logging.info(f"Bağlantı açıldı: {b.i1.ad} ↔ {b.i2.ad}")
+
+    def sure_guncelle(self, kid, sure):
+        """Bağlantının süresini (ör. gecikme) O(1) günceller."""
+        b = self.baglantilar[kid]
+        eski, b.sure = b.sure, sure
+        if b.acik:
+            b.i1.komsu_sure_guncelle(b.k1, sure)
+            b.i2.komsu_sure_guncelle(b.k2, sure)
+            self._bildir(b, eski, sure)
+        logging.info(f"Bağlantı süresi güncellendi: {b.i1.ad} ↔ {b.i2.ad} ({eski} → {sure} dk)")
+
+    def degisiklik_dinleyicisi_ekle(self, dinleyici):
+        """
+        Bağlantı değişikliklerinde çağrılacak fonksiyonu kaydeder.
+        Önceden hesaplanmış tablolar bu kanca ile seçici olarak geçersiz kılınır.
+        """
+        self._dinleyiciler.append(dinleyici)
+
+    def _bildir(self, b, eski, yeni):
+        """Rota önbelleğini seçici olarak temizler ve dinleyicileri çağırır."""
+        if self._hiz_siniri is not None and yeni is not None and (eski is None or yeni < eski):
+            self._hiz_sinirini_yukselt(b, yeni)
+        if self._rota_onbellegi:
+            if eski is not None and (yeni is None or yeni > eski):
+                # Süre arttı/kapandı: yalnızca bu bağlantıyı kullanan rotalar bozulur
+                for key, (_, _, kenarlar) in list(self._rota_onbellegi.items()):
+                    if b.kid in kenarlar:
+                        del self._rota_onbellegi[key]
+            elif yeni is not None and (eski is None or yeni < eski):
+                self._kisalan_baglantiyi_isle(b, eski, yeni)
+        if self._agac_onbellegi:
+            self._agaclari_guncelle(b, eski, yeni)
+        if self._hat_indeksi is not None and b.i1.hat == b.i2.hat:
+            # Yalnızca ilgili hattın önek toplamları yenilenir
+            hat = self._hat_indeksi.get(b.i1.hat)
+            if hat is not None:
+                hat.yenile(self.baglantilar)
+        for dinleyici in self._dinleyiciler:
+            dinleyici(b, eski, yeni)
+
+    def _kisalan_baglantiyi_isle(self, b, eski, yeni):
+        """
+        Süre azaldı/açıldı. Bağlantıyı zaten kullanan rotalar en iyi kalır, süreleri (eski - yeni)
+        kadar kısalır. Kullanmayan bir rota ancak bağlantı üzerinden, dolayısıyla i1 üzerinden
+        kısalabilir: d(bas, i1) + d(i1, hedef) süresinden kısaysa silinir (bağlantısız böyle bir yol
+        zaten vardı olamaz, test kesindir). d, i1'den en uzun aday rota süresiyle sınırlı tek
+        aramayla bulunur; sınıra ulaşılamayan istasyonlar sınır kadar uzak sayılır.
+        """
+        rotalar = self._rota_onbellegi
+        adaylar = []
+        for key, (path, sure, kenarlar) in list(rotalar.items()):
+            if eski is not None and b.kid in kenarlar:
+                rotalar[key] = (path, sure - (eski - yeni), kenarlar)
+            elif sure > yeni:
+                adaylar.append((key, sure))
+        if not adaylar:
+            return
+        sinir = max(sure for _, sure in adaylar)
+        mesafe = {ist: t for ist, t, _ in self.erisilebilir_istasyonlar(b.i1, sinir)}
+        for key, sure in adaylar:
+            if mesafe.get(key[0], sinir) + mesafe.get(key[1], sinir) < sure:
+                del rotalar[key]
+
+    def _agaclari_guncelle(self, b, eski, yeni):
+        """Değişiklikten gerçekten etkilenen en kısa yol ağaçlarını siler."""
+        sonsuz = float('inf')
+        for kok, (mesafe, sonraki) in list(self._agac_onbellegi.items()):
+            if eski is not None and (yeni is None or yeni > eski):
+                # Yalnızca ağaç kenarıysa mesafeler değişebilir
+                bozuk = sonraki.get(b.i1) is b.i2 or sonraki.get(b.i2) is b.i1
+            else:
+                # Yeni/kısalan kenar ancak bir mesafeyi kısaltıyorsa ağacı değiştirir
+                d1, d2 = mesafe.get(b.i1, sonsuz), mesafe.get(b.i2, sonsuz)
+                bozuk = d1 + yeni < d2 or d2 + yeni < d1
+            if bozuk:
+                del self._agac_onbellegi[kok]
+
+    def rota_baglantilari(self, rota) -> Tuple[int, ...]:
+        """Rotadaki ardışık istasyonlar arasında kullanılan (en kısa) bağlantı ID'leri."""
+        kenarlar = []
+        for a, b in zip(rota, rota[1:]):
+            kenarlar.append(min((t, kid) for (nbr, t), kid in zip(a.komsular, a.kenar_idleri) if nbr is b)[1])
+        return tuple(kenarlar)
+
+    # --- Bağlı bileşen indeksi ---
+
+    def _kok(self, ist):
+        """Union-find kökünü bulur (yol sıkıştırmalı)."""
+        kok = ist
+        while self._ebeveyn[kok] is not kok:
+            kok = self._ebeveyn[kok]
+        while self._ebeveyn[ist] is not kok:
+            self._ebeveyn[ist], ist = kok, self._ebeveyn[ist]
+        return kok
+
+    def _birlestir(self, i1, i2):
+        """İki istasyonun bileşenlerini rank'e göre birleştirir."""
+        k1, k2 = self._kok(i1), self._kok(i2)
+        if k1 is k2:
+            return
+        if self._rank[k1] < self._rank[k2]:
+            k1, k2 = k2, k1
+        self._ebeveyn[k2] = k1
+        if self._rank[k1] == self._rank[k2]:
+            self._rank[k1] += 1
+
+    def bilesen_indeksini_yenile(self):
+        """
+        Bileşen indeksini yalnızca açık bağlantılardan baştan kurar (açık istekle çağrılır).
+        Kapanışlar indeksi bozmaz, yalnızca gevşetir; uzun süre kapalı kalan bağlantılar
+        ağı gerçekten bölmüşse reddin yeniden O(1) olması için kullanılır.
+        """
+        for ist in self._id_index.values():
+            self._ebeveyn[ist] = ist
+            self._rank[ist] = 0
+        for ist in self._id_index.values():
+            for nbr, _ in ist.komsular:
+                self._birlestir(ist, nbr)
+
+    def ulasilabilir_mi(self, bas, hedef) -> bool:
+        """
+        İki istasyon aynı bileşende mi? (amortize O(1))
+        İndeks eklenmiş tüm bağlantılardan kurulur: kapanış iki bileşeni birleştiremeyeceği için
+        False kesin ulaşılamaz demektir. True ise kapanışlar yolu kesmiş olabilir; bu durumda
+        arama None döndürür.
+        """
+        return self._kok(bas) is self._kok(hedef)
 
     def en_az_aktarma_bul(self, bas, hedef):
         """
         BFS algoritması kullanarak EN AZ aktarmalı rotayı bulur.
-        Kuyruk elemanı: (istasyon, rota_listesi)
-        """
-        queue = deque([(bas, [bas])])
-        visited = {bas}
-        while queue:
-            curr, path = queue.popleft()
-            if curr == hedef:
-                return path
+        Rota her adımda kopyalanmaz; önceki istasyon işaretçilerinden geri kurulur.
+        Hedef kuyruğa girerken bulunur (bir seviye erken durur).
+        """
+        if not self.ulasilabilir_mi(bas, hedef):
+            logging.warning(f"Rota bulunamadı: {bas.ad} → {hedef.ad}")
+            return None
+        onceki: Dict[Istasyon, Optional[Istasyon]] = {bas: None}
+        queue = deque([bas])
+        while queue and hedef not in onceki:
+            curr = queue.popleft()
             for nbr, _ in curr.komsular:
-                if nbr not in visited:
-                    visited.add(nbr)
-                    queue.append((nbr, path + [nbr]))
-        return None
+                if nbr not in onceki:
+                    onceki[nbr] = curr
+                    queue.append(nbr)
+        if hedef not in onceki:
+            return None
+        path = [hedef]
+        while onceki[path[-1]] is not None:
+            path.append(onceki[path[-1]])
+        path.reverse()
+        return path
+
+    def hiz_siniri(self) -> float:
+        """
+        Açık bağlantılarda kuş uçuşu mesafe / süre oranının en büyüğü (km/dk).
+        Koordinatı olmayan istasyon varsa ya da sıfır süreli bir bağlantı iki farklı
+        konumu birleştiriyorsa 0 döner (sezgisel kapalı). Açılan ya da hızlanan bağlantıda
+        yükseltilir; yavaşlayan ya da kapanan bağlantıdan sonra eski sınır kabul edilebilir kalır.
+        """
+        if self._hiz_siniri is None:
+            from metro_mekan import haversine_km
+            hiz = 0.0
+            if any(ist.enlem is None or ist.boylam is None for ist in self._id_index.values()):
+                self._hiz_siniri = 0.0
+                return 0.0
+            for b in self.baglantilar:
+                if not b.acik:
+                    continue
+                d = haversine_km(b.i1.enlem, b.i1.boylam, b.i2.enlem, b.i2.boylam)
+                if d == 0:
+                    continue
+                if b.sure <= 0:
+                    hiz = 0.0
+                    break
+                hiz = max(hiz, d / b.sure)
+            self._hiz_siniri = hiz
+        return self._hiz_siniri
+
+    def _hiz_sinirini_yukselt(self, b, yeni):
+        """Açılan/hızlanan bağlantı için hız sınırını O(1) günceller."""
+        if self._hiz_siniri == 0:
+            self._hiz_siniri = None  # sezgisel kapalıydı; gerekirse baştan denetlenir
+            return
+        from metro_mekan import haversine_km
+        d = haversine_km(b.i1.enlem, b.i1.boylam, b.i2.enlem, b.i2.boylam)
+        if d > 0:
+            self._hiz_siniri = 0.0 if yeni <= 0 else max(self._hiz_siniri, d / yeni)
 
     def en_hizli_rota_bul(self, bas, hedef):
         """
-        A* benzeri algoritma ile EN HIZLI rotayı bulur.
-        Öncelik kuyruğu ile toplam süreye göre seçim yapar.
+        EN HIZLI rotayı bulur. Tüm istasyonların koordinatı varsa A* kullanılır:
+        h(n) = hedefe kuş uçuşu mesafe / ağdaki en yüksek hız; hiçbir yol bundan kısa
+        sürmeyeceği için kabul edilebilir ve tutarlıdır. Koordinat yoksa iki uçtan
+        aynı anda ilerleyen çift yönlü Dijkstra kullanılır (yaklaşık yarı kadar istasyon açar).
+        Sonuçlar önbelleğe alınır; bağlantı değişikliklerinde seçici olarak silinir.
+        """
+        kayit = self._rota_onbellegi.get((bas, hedef))
+        if kayit is not None:
+            return list(kayit[0]), kayit[1]
+        if not self.ulasilabilir_mi(bas, hedef):
+            logging.warning(f"Rota bulunamadı: {bas.ad} → {hedef.ad}")
+            return None
+        if bas is hedef:
+            sonuc = [bas], (), 0
+        elif self.hiz_siniri() > 0:
+            sonuc = self._a_yildiz(bas, hedef)
+        else:
+            sonuc = self._cift_yonlu_dijkstra(bas, hedef)
+        if sonuc is None:
+            logging.warning(f"Rota bulunamadı: {bas.ad} → {hedef.ad}")
+            return None
+        path, kenarlar, cost = sonuc
+        self._onbellege_ekle(bas, hedef, path, cost, kenarlar)
+        return path, cost
+
+    @staticmethod
+    def _geri_kur(onceki, ist) -> Tuple[List[Istasyon], List[int]]:
+        """
+        Önceki işaretçilerinden istasyondan aramanın köküne giden yolu ve bağlantı ID'lerini kurar.
+        onceki[x] = (y, i): x'e y'nin komşu listesindeki i. bağlantıyla ulaşıldı.
+        """
+        yol, kenarlar = [ist], []
+        kayit = onceki[ist]
+        while kayit is not None:
+            ust, i = kayit
+            kenarlar.append(ust.kenar_idleri[i])
+            yol.append(ust)
+            kayit = onceki[ust]
+        return yol, kenarlar
+
+    def _a_yildiz(self, bas, hedef):
+        """Koordinat sezgiselli A*; (rota, bağlantı ID'leri, süre) döndürür."""
+        from metro_mekan import haversine_km
+        # Kayan nokta hatası sezgiseli gerçek süre üstüne çıkarmasın diye küçük pay
+        olcek = (1 - 1e-9) / self.hiz_siniri()
+        tahmin: Dict[Istasyon, float] = {}  # her istasyon için bir kez hesaplanır
+
+        def h(ist):
+            deger = tahmin.get(ist)
+            if deger is None:
+                deger = tahmin[ist] = haversine_km(ist.enlem, ist.boylam, hedef.enlem, hedef.boylam) * olcek
+            return deger
+
+        # Rota listesi her adımda kopyalanmaz; önceki işaretçilerinden (bağlantı konumuyla) geri kurulur.
+        # Sezgisel tutarlı olduğundan ziyaret kümesi gerekmez: en iyi süreden büyük girişler bayattır.
+        push, pop = heapq.heappush, heapq.heappop
+        sayac = 0
+        pq = [(h(bas), sayac, 0, bas)]
+        en_iyi = {bas: 0}
+        get = en_iyi.get
+        onceki: Dict[Istasyon, Optional[Tuple[Istasyon, int]]] = {bas: None}
+        while pq:
+            _, _, cost, curr = pop(pq)
+            if cost > en_iyi[curr]:
+                continue
+            if curr is hedef:
+                self._count = sayac
+                path, kenarlar = self._geri_kur(onceki, hedef)
+                path.reverse()
+                kenarlar.reverse()
+                return path, tuple(kenarlar), cost
+            i = -1
+            for nbr, t in curr.komsular:
+                i += 1
+                yeni = cost + t
+                if yeni < get(nbr, yeni + 1):
+                    en_iyi[nbr] = yeni
+                    onceki[nbr] = (curr, i)
+                    sayac += 1
+                    push(pq, (yeni + h(nbr), sayac, yeni, nbr))
+        self._count = sayac
+        return None
+
+    def _cift_yonlu_dijkstra(self, bas, hedef):
+        """
+        Baştan ve hedeften sırayla (kuyruk tepesi küçük olan taraf) ilerleyen Dijkstra.
+        Bir taraf diğerinin etiketlediği istasyona ulaştığında aday süre güncellenir;
+        iki kuyruğun tepe toplamı en iyi adaya ulaşınca aday kesinleşmiştir.
+        (rota, bağlantı ID'leri, süre) döndürür.
+        """
+        push, pop = heapq.heappush, heapq.heappop
+        ileri_mesafe, geri_mesafe = {bas: 0}, {hedef: 0}
+        ileri_onceki: Dict[Istasyon, Optional[Tuple[Istasyon, int]]] = {bas: None}
+        geri_onceki: Dict[Istasyon, Optional[Tuple[Istasyon, int]]] = {hedef: None}
+        ileri_pq, geri_pq = [(0, 0, bas)], [(0, 0, hedef)]
+        en_iyi = float('inf')
+        bulusma = None  # (ileri taraftaki istasyon, geri taraftaki istasyon, bağlantı ID'si)
+        sayac = 0
+        while ileri_pq and geri_pq and ileri_pq[0][0] + geri_pq[0][0] < en_iyi:
+            ileri = ileri_pq[0][0] <= geri_pq[0][0]
+            if ileri:
+                pq, mesafe, onceki, karsi = ileri_pq, ileri_mesafe, ileri_onceki, geri_mesafe
+            else:
+                pq, mesafe, onceki, karsi = geri_pq, geri_mesafe, geri_onceki, ileri_mesafe
+            cost, _, curr = pop(pq)
+            if cost > mesafe[curr]:
+                continue
+            get, karsi_get = mesafe.get, karsi.get
+            i = -1
+            for nbr, t in curr.komsular:
+                i += 1
+                yeni = cost + t
+                if yeni < get(nbr, yeni + 1):
+                    mesafe[nbr] = yeni
+                    onceki[nbr] = (curr, i)
+                    sayac += 1
+                    push(pq, (yeni, sayac, nbr))
+                diger = karsi_get(nbr)
+                if diger is not None and yeni + diger < en_iyi:
+                    en_iyi = yeni + diger
+                    kid = curr.kenar_idleri[i]
+                    bulusma = (curr, nbr, kid) if ileri else (nbr, curr, kid)
+        self._count = sayac
+        if bulusma is None:
+            return None
+        a, b, kid = bulusma
+        ilk, ilk_kenarlar = self._geri_kur(ileri_onceki, a)
+        son, son_kenarlar = self._geri_kur(geri_onceki, b)
+        ilk.reverse()
+        ilk_kenarlar.reverse()
+        return ilk + son, tuple(ilk_kenarlar + [kid] + son_kenarlar), en_iyi
+
+    def en_kisa_yol_agaci(self, kok):
+        """
+        Kökten tüm istasyonlara Dijkstra en kısa yol ağacını döndürür (önbellekli).
+        Bağlantılar çift yönlü olduğundan 'sonraki' her istasyondan köke giden
+        yoldaki bir sonraki istasyonu verir.
+        """
+        agac = self._agac_onbellegi.get(kok)
+        if agac is not None:
+            return agac
+        mesafe = {kok: 0}
+        sonraki = {kok: None}
+        pq = [(0, 0, kok)]
+        sayac = 0
+        visited = set()
+        while pq:
+            cost, _, curr = heapq.heappop(pq)
+            if curr in visited:
+                continue
+            visited.add(curr)
+            for nbr, t in curr.komsular:
+                yeni = cost + t
+                if nbr not in visited and yeni < mesafe.get(nbr, float('inf')):
+                    mesafe[nbr] = yeni
+                    sonraki[nbr] = curr
+                    sayac += 1
+                    heapq.heappush(pq, (yeni, sayac, nbr))
+        self._agac_onbellegi[kok] = (mesafe, sonraki)
+        return mesafe, sonraki
+
+    def erisilebilir_istasyonlar(self, bas, sure_butcesi, aktarma_butcesi=None):
+        """
+        Süre (ve isteğe bağlı aktarma) bütçesi içinde ulaşılabilen istasyonları
+        varış süresine göre sıralı (istasyon, süre, aktarma) olarak üretir.
+        Farklı hatlar arasındaki her bağlantı bir aktarma sayılır. Aktarma bütçesi
+        verildiğinde durum (istasyon, aktarma) olur; bir istasyona daha az aktarmayla
+        zaten ulaşıldıysa daha çok aktarmalı (ve daha geç) etiketler genişletilmez.
+        Bütçeyi aşan adımlar kuyruğa hiç girmez; maliyet erişilebilir bölgeyle sınırlıdır.
+        """
+        pq = [(0, 0, 0, bas)]
+        sayac = 0
+        en_az_aktarma: Dict[Istasyon, int] = {}
+        while pq:
+            cost, aktarma, _, curr = heapq.heappop(pq)
+            onceki = en_az_aktarma.get(curr)
+            if onceki is not None and (aktarma_butcesi is None or aktarma >= onceki):
+                continue
+            en_az_aktarma[curr] = aktarma
+            if onceki is None:
+                yield curr, cost, aktarma
+            for nbr, t in curr.komsular:
+                yeni = cost + t
+                if yeni > sure_butcesi:
+                    continue
+                k = aktarma + (nbr.hat != curr.hat)
+                if aktarma_butcesi is not None and k > aktarma_butcesi:
+                    continue
+                gorulen = en_az_aktarma.get(nbr)
+                if gorulen is None or (aktarma_butcesi is not None and k < gorulen):
+                    sayac += 1
+                    heapq.heappush(pq, (yeni, k, sayac, nbr))
+
+    @staticmethod
+    def agac_yolu(ist, sonraki):
+        """Ağaç üzerinde istasyondan köke giden yolu döndürür."""
+        yol = [ist]
+        while sonraki[yol[-1]] is not None:
+            yol.append(sonraki[yol[-1]])
+        return yol
+
+    def _kisitli_arama(self, bas, hedef, yasak_dugum, yasak_kenar, mesafe, sonraki):
         """
-        pq = []
-        self._count = 0
-        heapq.heappush(pq, (0, self._count, bas, [bas]))
+        Yen algoritmasının sapma (spur) araması.
+        Hedef ağacındaki mesafeler kesin alt sınır olduğundan A* sezgiseli
+        olarak kullanılır; açılan istasyonun ağaç yolu yasaklara takılmıyorsa
+        arama o anda biter.
+        """
+        pq = [(mesafe[bas], 0, 0, bas)]
+        onceki = {bas: None}
+        g = {bas: 0}
+        sayac = 0
         visited = set()
         while pq:
-            cost, _, curr, path = heapq.heappop(pq)
-            if curr == hedef:
-                return path, cost
+            _, _, cost, curr = heapq.heappop(pq)
             if curr in visited:
                 continue
             visited.add(curr)
+            yol = [curr]
+            while onceki[yol[-1]] is not None:
+                yol.append(onceki[yol[-1]])
+            yol.reverse()
+            kuyruk = self.agac_yolu(curr, sonraki)
+            yoldakiler = set(yol)
+            if (not any(x in yasak_dugum or x in yoldakiler for x in kuyruk[1:])
+                    and (curr is not bas or len(kuyruk) == 1 or (bas, kuyruk[1]) not in yasak_kenar)):
+                return yol + kuyruk[1:], cost + mesafe[curr]
             for nbr, t in curr.komsular:
-                if nbr not in visited:
-                    self._count += 1
-                    heapq.heappush(pq, (cost + t, self._count, nbr, path + [nbr]))
+                if nbr in visited or nbr in yasak_dugum or nbr not in mesafe:
+                    continue
+                if curr is bas and (bas, nbr) in yasak_kenar:
+                    continue
+                yeni = cost + t
+                if yeni < g.get(nbr, float('inf')):
+                    g[nbr] = yeni
+                    onceki[nbr] = curr
+                    sayac += 1
+                    heapq.heappush(pq, (yeni + mesafe[nbr], sayac, yeni, nbr))
         return None
 
+    def _k_en_kisa_yollar(self, bas, hedef, k):
+        """
+        Yen algoritması ile döngüsüz k en kısa yolu (ham, aktarma adımları dahil)
+        döndürür. temizle_rota sonrası aynı görünen rotalar tek sayılır.
+        """
+        if k <= 0 or not self.ulasilabilir_mi(bas, hedef):
+            return []
+        mesafe, sonraki = self.en_kisa_yol_agaci(hedef)
+        if bas not in sonraki:  # kapanışlar nedeniyle ayrılmış
+            return []
+
+        def birikimli(yol):
+            toplam = [0]
+            for a, b in zip(yol, yol[1:]):
+                toplam.append(toplam[-1] + min(t for nbr, t in a.komsular if nbr is b))
+            return toplam
+
+        ilk = self.agac_yolu(bas, sonraki)
+        A = [(ilk, birikimli(ilk))]
+        B = []
+        gorulen = {tuple(ilk)}
+        sonuc = [(ilk, mesafe[bas])]
+        secilen = {tuple(st.ad for st in temizle_rota(ilk))}
+        sayac = 0
+        while len(sonuc) < k:
+            onceki_yol, onceki_toplam = A[-1]
+            for i in range(len(onceki_yol) - 1):
+                spur = onceki_yol[i]
+                kok = onceki_yol[:i + 1]
+                yasak_kenar = {(spur, yol[i + 1]) for yol, _ in A if len(yol) > i + 1 and yol[:i + 1] == kok}
+                bulunan = self._kisitli_arama(spur, hedef, set(kok[:-1]), yasak_kenar, mesafe, sonraki)
+                if bulunan is None:
+                    continue
+                aday = kok[:-1] + bulunan[0]
+                if tuple(aday) not in gorulen:
+                    gorulen.add(tuple(aday))
+                    sayac += 1
+                    heapq.heappush(B, (onceki_toplam[i] + bulunan[1], sayac, aday))
+            if not B:
+                break
+            cost, _, yol = heapq.heappop(B)
+            A.append((yol, birikimli(yol)))
+            adlar = tuple(st.ad for st in temizle_rota(yol))
+            if adlar not in secilen:
+                secilen.add(adlar)
+                sonuc.append((yol, cost))
+        return sonuc
+
+    def k_alternatif_rota(self, bas, hedef, k=3, ham=False):
+        """
+        En hızlıdan başlayarak k alternatif rotayı [(rota, süre), ...] olarak döndürür.
+        Aynı isimli aktarma adımları temizle_rota ile birleştirilir; ham=True ise rotalar
+        aktarma adımlarıyla birlikte (ör. rota_baglantilari için) döndürülür.
+        """
+        yollar = self._k_en_kisa_yollar(bas, hedef, k)
+        if ham:
+            return yollar
+        return [(temizle_rota(yol), cost) for yol, cost in yollar]
+
+    def hat_sirasi(self) -> Dict[str, Tuple[List[Istasyon], List[int]]]:
+        """
+        Her hattın duraklarını hat boyunca sıralar (kapalı bağlantılar dahil, yapısal sıra).
+        Döndürür: hat -> (sıralı istasyonlar, ardışık duraklar arasındaki bağlantı ID'leri)
+        Dallanan, halka ya da birbirinden kopuk parçalardan oluşan hatlar doğrusal
+        sıraya konamadığı için atlanır.
+        """
+        hat_kenarlari: Dict[str, Dict[Istasyon, Dict[Istasyon, int]]] = defaultdict(lambda: defaultdict(dict))
+        for b in self.baglantilar:
+            if b.i1.hat == b.i2.hat and b.i1 is not b.i2:
+                for x, y in ((b.i1, b.i2), (b.i2, b.i1)):
+                    eski = hat_kenarlari[b.i1.hat][x].get(y)
+                    if eski is None or b.sure < self.baglantilar[eski].sure:
+                        hat_kenarlari[b.i1.hat][x][y] = b.kid
+        sonuc = {}
+        for hat, komsu in hat_kenarlari.items():
+            uclar = [ist for ist in self._id_index.values() if ist.hat == hat and len(komsu.get(ist, ())) == 1]
+            duraklar = [ist for ist in self._id_index.values() if ist.hat == hat and ist in komsu]
+            if len(uclar) != 2 or any(len(komsu[ist]) > 2 for ist in duraklar):
+                logging.warning(f"{hat} doğrusal değil, hat sırasına eklenmedi")
+                continue
+            # Bir uçtan öbürüne yürü; tüm durakları gezmeyen yürüyüş ayrık bir halka demektir
+            sira, kenarlar = [uclar[0]], []
+            onceki = None
+            while True:
+                curr = sira[-1]
+                nbr = next((x for x in komsu[curr] if x is not onceki), None)
+                if nbr is None:
+                    break
+                kenarlar.append(komsu[curr][nbr])
+                onceki = curr
+                sira.append(nbr)
+            if len(sira) != len(duraklar):
+                logging.warning(f"{hat} kopuk parçalardan oluşuyor, hat sırasına eklenmedi")
+                continue
+            sonuc[hat] = (sira, kenarlar)
+        return sonuc
+
+    # --- Hat indeksi: önek toplamları ve hat seviyesi arama ---
+
+    def hat_indeksi(self) -> Dict[str, 'HatIndeksi']:
+        """Doğrusal hatların önek toplamı indeksini ve hat seviyesi aktarma grafını (gerekirse) kurar."""
+        if self._hat_indeksi is not None:
+            return self._hat_indeksi
+        self._hat_indeksi = {}
+        self._hat_konumu = {}
+        for hat, (duraklar, kenarlar) in self.hat_sirasi().items():
+            indeks = HatIndeksi(hat, duraklar, kenarlar, self.baglantilar)
+            self._hat_indeksi[hat] = indeks
+            for i, ist in enumerate(duraklar):
+                self._hat_konumu[ist] = (indeks, i)
+
+        # Aktarma grafı: düğümler hat uçları ve hat dışı bağlantısı olan istasyonlar
+        anahtar = set()
+        for b in self.baglantilar:
+            if b.i1.hat != b.i2.hat:
+                anahtar.update((b.i1, b.i2))
+        for indeks in self._hat_indeksi.values():
+            anahtar.update((indeks.duraklar[0], indeks.duraklar[-1]))
+        graf: Dict[Istasyon, List[Tuple[Istasyon, Optional[HatIndeksi], int]]] = defaultdict(list)
+        for indeks in self._hat_indeksi.values():
+            indeks.anahtarlar = [i for i, ist in enumerate(indeks.duraklar) if ist in anahtar]
+            for i, j in zip(indeks.anahtarlar, indeks.anahtarlar[1:]):
+                graf[indeks.duraklar[i]].append((indeks.duraklar[j], indeks, -1))
+                graf[indeks.duraklar[j]].append((indeks.duraklar[i], indeks, -1))
+        for b in self.baglantilar:
+            if b.i1.hat != b.i2.hat:
+                graf[b.i1].append((b.i2, None, b.kid))
+                graf[b.i2].append((b.i1, None, b.kid))
+        self._aktarma_grafi = graf
+        self._tum_hatlar_dogrusal = not any(b.i1.hat == b.i2.hat and b.i1.hat not in self._hat_indeksi
+                                            for b in self.baglantilar)
+        return self._hat_indeksi
+
+    def hat_ici_sure(self, a, b) -> Optional[int]:
+        """Aynı hattaki iki istasyon arası süre (O(1)); farklı hat veya kapalı kesitte None."""
+        self.hat_indeksi()
+        ka, kb = self._hat_konumu.get(a), self._hat_konumu.get(b)
+        if ka is None or kb is None or ka[0] is not kb[0]:
+            return None
+        return ka[0].sure(ka[1], kb[1])
+
+    def rota_bacaklari(self, rota) -> List[Tuple[Optional[str], Istasyon, Istasyon, int, int]]:
+        """
+        Durak durak rotayı bacaklara sıkıştırır: (hat, biniş, iniş, durak sayısı, süre).
+        Hat değiştiren (aktarma) adımlarda hat None'dır.
+        """
+        self.hat_indeksi()
+        bacaklar = []
+        i = 0
+        while i < len(rota) - 1:
+            a, b = rota[i], rota[i + 1]
+            if a.hat != b.hat:
+                bacaklar.append((None, a, b, 1, min(t for nbr, t in a.komsular if nbr is b)))
+                i += 1
+                continue
+            j = i + 1
+            while j + 1 < len(rota) and rota[j + 1].hat == a.hat:
+                j += 1
+            sure = self.hat_ici_sure(a, rota[j])
+            if sure is None:
+                sure = sum(min(t for nbr, t in x.komsular if nbr is y) for x, y in zip(rota[i:j], rota[i + 1:j + 1]))
+            bacaklar.append((a.hat, a, rota[j], j - i, sure))
+            i = j
+        return bacaklar
+
+    def hat_seviyesi_rota_bul(self, bas, hedef):
+        """
+        En hızlı rotayı yalnızca aktarma istasyonları üzerinde arar; ara duraklar
+        önek toplamlarıyla atlanır ve sonuç durak durak rotaya genişletilir.
+        Doğrusal olmayan hat varsa en_hizli_rota_bul kullanılır.
+        """
+        self.hat_indeksi()
+        if not self._tum_hatlar_dogrusal or bas not in self._hat_konumu or hedef not in self._hat_konumu:
+            return self.en_hizli_rota_bul(bas, hedef)
+        if not self.ulasilabilir_mi(bas, hedef):
+            logging.warning(f"Rota bulunamadı: {bas.ad} → {hedef.ad}")
+            return None
+
+        def kenarlar(ist):
+            # Anahtar olmayan uç istasyonlar için hattaki en yakın anahtar duraklar
+            if ist in self._aktarma_grafi:
+                yield from self._aktarma_grafi[ist]
+            else:
+                indeks, pos = self._hat_konumu[ist]
+                k = bisect.bisect_left(indeks.anahtarlar, pos)
+                for j in (k - 1, k):
+                    if 0 <= j < len(indeks.anahtarlar):
+                        yield indeks.duraklar[indeks.anahtarlar[j]], indeks, -1
+            hk = self._hat_konumu[hedef]
+            if ist is not hedef and self._hat_konumu[ist][0] is hk[0]:
+                yield hedef, hk[0], -1
+
+        mesafe = {bas: 0}
+        onceki: Dict[Istasyon, Optional[Istasyon]] = {bas: None}
+        pq = [(0, 0, bas)]
+        sayac = 0
+        visited = set()
+        while pq:
+            cost, _, curr = heapq.heappop(pq)
+            if curr is hedef:
+                break
+            if curr in visited:
+                continue
+            visited.add(curr)
+            for nbr, indeks, kid in kenarlar(curr):
+                if kid >= 0:
+                    b = self.baglantilar[kid]
+                    if not b.acik:
+                        continue
+                    t = b.sure
+                else:
+                    t = indeks.sure(self._hat_konumu[curr][1], self._hat_konumu[nbr][1])
+                    if t is None:
+                        continue
+                if nbr not in visited and cost + t < mesafe.get(nbr, float('inf')):
+                    mesafe[nbr] = cost + t
+                    onceki[nbr] = curr
+                    sayac += 1
+                    heapq.heappush(pq, (cost + t, sayac, nbr))
+        if hedef not in onceki:
+            return None
+
+        # Düğüm rotasını ara duraklarla genişlet
+        dugumler = [hedef]
+        while onceki[dugumler[-1]] is not None:
+            dugumler.append(onceki[dugumler[-1]])
+        dugumler.reverse()
+        rota = [bas]
+        for a, b in zip(dugumler, dugumler[1:]):
+            rota.extend(self.hat_kesiti(a, b) if a.hat == b.hat else [b])
+        return rota, mesafe[hedef]
+
+    def hat_kesiti(self, a, b) -> List[Istasyon]:
+        """Aynı hattaki a'dan b'ye giderken a'dan sonraki durakları (b dahil) döndürür."""
+        self.hat_indeksi()
+        indeks, i = self._hat_konumu[a]
+        j = self._hat_konumu[b][1]
+        adim = 1 if j > i else -1
+        return [indeks.duraklar[k] for k in range(i + adim, j + adim, adim)]
+
+    def kompakt(self) -> 'KompaktAg':
+        """Açık bağlantılardan tamsayı indeksli, pickle edilebilir bir görünüm üretir."""
+        idler = list(self._id_index)
+        indeks = {idx: i for i, idx in enumerate(idler)}
+        kenarlar = [(b.kid, indeks[b.i1.idx], indeks[b.i2.idx], b.sure) for b in self.baglantilar if b.acik]
+        return KompaktAg(idler, kenarlar)
+
+    def sure_matrisi(self, kaynaklar, hedefler, isci=1):
+        """
+        Kaynak × hedef en hızlı süre matrisini NumPy dizisi olarak döndürür (ulaşılamaz: inf).
+        Her kaynak için tek arama yapılır ve tüm hedefler kesinleşince durur;
+        isci > 1 ise kaynaklar süreç havuzuna dağıtılır.
+        """
+        import numpy as np
+
+        ag = self.kompakt()
+        hedef_indeks = [ag.indeks[h.idx] for h in hedefler]
+        gorevler = [(ag.indeks[k.idx], hedef_indeks) for k in kaynaklar]
+        if isci <= 1 or len(gorevler) < 2:
+            _matris_isci_baslat(ag)
+            satirlar = [_matris_satiri(g) for g in gorevler]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=isci, initializer=_matris_isci_baslat, initargs=(ag,)) as havuz:
+                satirlar = list(havuz.map(_matris_satiri, gorevler, chunksize=max(1, len(gorevler) // (4 * isci))))
+        return np.array(satirlar, dtype=float).reshape(len(kaynaklar), len(hedefler))
+
+    def _onbellege_ekle(self, bas, hedef, path, cost, kenarlar):
+        """
+        Rotayı aramanın kaydettiği bağlantı ID'leriyle önbelleğe ekler; kapasite aşılırsa en eski
+        kayıt atılır. Ters indeks tutulmaz: değişiklikte önbellek bağlantı ID'sine göre taranır.
+        """
+        if self.onbellek_boyutu <= 0:
+            return
+        if len(self._rota_onbellegi) >= self.onbellek_boyutu:
+            del self._rota_onbellegi[next(iter(self._rota_onbellegi))]
+        self._rota_onbellegi[(bas, hedef)] = (tuple(path), cost, kenarlar)
+
     def format_rota(self, rota):
         """Verilen rotayı okunabilir şekilde renkli yazı olarak döndürür."""
         return " -> ".join(st.renkli_ad() for st in rota)
 
-def animate_train(distance=30, delay=0.05):
-    """Terminalde tren hareketini simüle eden animasyon."""
-    print("\nAnimasyon başlıyor...")
-    for pos in range(distance):
-        print(' ' * pos + '🚆', end='\r')
-        time.sleep(delay)
-    print()
+class HatIndeksi:
+    """
+    Doğrusal bir hattın sıralı durakları ve kümülatif süre (önek toplamı) dizisi.
+    Aynı hattaki iki durak arası süre ve kapalı kesit kontrolü O(1)'dir.
+    """
+    def __init__(self, hat: str, duraklar: List[Istasyon], kenarlar: List[int], baglantilar: List[Baglanti]):
+        self.hat = hat
+        self.duraklar = duraklar
+        self.kenarlar = kenarlar      # duraklar[i] ile duraklar[i + 1] arasındaki bağlantı ID'si
+        self.anahtarlar: List[int] = []  # aktarma grafındaki durakların sıra indeksleri
+        self.onek: List[int] = []
+        self.kapali_onek: List[int] = []
+        self.yenile(baglantilar)
+
+    def yenile(self, baglantilar: List[Baglanti]):
+        """Önek toplamlarını bağlantıların güncel süre/kapalılık durumundan yeniden hesaplar."""
+        onek, kapali = [0], [0]
+        for kid in self.kenarlar:
+            b = baglantilar[kid]
+            onek.append(onek[-1] + b.sure)
+            kapali.append(kapali[-1] + (not b.acik))
+        self.onek = onek
+        self.kapali_onek = kapali
 
-if __name__ == '__main__':
+    def sure(self, i: int, j: int) -> Optional[int]:
+        """i. ve j. duraklar arası süre; arada kapalı bağlantı varsa None."""
+        if i > j:
+            i, j = j, i
+        if self.kapali_onek[j] != self.kapali_onek[i]:
+            return None
+        return self.onek[j] - self.onek[i]
+
+class KompaktAg:
+    """
+    Metro ağının tamsayı indeksli, salt okunur görünümü.
+    Tüm çiftler analizi gibi toplu işler ve işçi süreçleri için kullanılır.
+    """
+    def __init__(self, idler: List[str], kenarlar: List[Tuple[int, int, int, int]]):
+        self.idler = idler                         # indeks -> istasyon ID
+        self.indeks = {idx: i for i, idx in enumerate(idler)}
+        self.kenarlar = kenarlar                   # (bağlantı ID, u, v, süre)
+        self.komsu: List[List[Tuple[int, int, int]]] = [[] for _ in idler]  # u -> (v, süre, bağlantı ID)
+        for kid, u, v, sure in kenarlar:
+            self.komsu[u].append((v, sure, kid))
+            self.komsu[v].append((u, sure, kid))
+
+    def agac(self, kaynak, agirlik=None, hedefler=None, yasak=-1):
+        """
+        Kaynaktan Dijkstra en kısa yol ağacı.
+        agirlik: bağlantı ID -> süre (verilmezse kayıtlı süreler)
+        hedefler: hepsi kesinleşince arama durur
+        yasak: yok sayılacak bağlantı ID'si
+        Döndürür: (mesafe, onceki, onceki_kenar, sira)
+        """
+        n = len(self.idler)
+        mesafe = [float('inf')] * n
+        onceki = [-1] * n
+        onceki_kenar = [-1] * n
+        mesafe[kaynak] = 0
+        kalan = set(hedefler) if hedefler is not None else None
+        sira = []
+        kapali = [False] * n
+        pq = [(0, kaynak)]
+        while pq:
+            cost, u = heapq.heappop(pq)
+            if kapali[u]:
+                continue
+            kapali[u] = True
+            sira.append(u)
+            if kalan is not None:
+                kalan.discard(u)
+                if not kalan:
+                    break
+            for v, t, kid in self.komsu[u]:
+                if kid == yasak or kapali[v]:
+                    continue
+                yeni = cost + (t if agirlik is None else agirlik[kid])
+                if yeni < mesafe[v]:
+                    mesafe[v] = yeni
+                    onceki[v] = u
+                    onceki_kenar[v] = kid
+                    heapq.heappush(pq, (yeni, v))
+        return mesafe, onceki, onceki_kenar, sira
+
+# sure_matrisi işçi süreçlerinde paylaşılan kompakt ağ
+_MATRIS_AGI: Optional[KompaktAg] = None
+
+def _matris_isci_baslat(ag: KompaktAg):
+    global _MATRIS_AGI
+    _MATRIS_AGI = ag
+
+def _matris_satiri(gorev: Tuple[int, List[int]]) -> List[float]:
+    """Tek kaynaktan hedeflere süreler (tüm hedefler kesinleşince arama durur)."""
+    kaynak, hedefler = gorev
+    mesafe = _MATRIS_AGI.agac(kaynak, hedefler=hedefler)[0]
+    return [mesafe[h] for h in hedefler]
+
+def ornek_ag() -> MetroAgi:
+    """Ankara örnek metro ağını (3 hat, 12 istasyon) kurar."""
     metro = MetroAgi()
 
-    # İstasyonları ekle
+    # İstasyonları ekle (konumlar yaklaşık enlem/boylam)
     data = [
-        ('K1','Kızılay','Kırmızı Hat'),('K2','Ulus','Kırmızı Hat'),('K3','Demetevler','Kırmızı Hat'),('K4','OSB','Kırmızı Hat'),
-        ('M1','AŞTİ','Mavi Hat'),('M2','Kızılay','Mavi Hat'),('M3','Sıhhıye','Mavi Hat'),('M4','Gar','Mavi Hat'),
-        ('T1','Batıkent','Turuncu Hat'),('T2','Demetevler','Turuncu Hat'),('T3','Gar','Turuncu Hat'),('T4','Keçiören','Turuncu Hat')
+        ('K1','Kızılay','Kırmızı Hat',39.9208,32.8541),('K2','Ulus','Kırmızı Hat',39.9417,32.8547),
+        ('K3','Demetevler','Kırmızı Hat',39.9676,32.8027),('K4','OSB','Kırmızı Hat',39.9703,32.7356),
+        ('M1','AŞTİ','Mavi Hat',39.9184,32.8101),('M2','Kızılay','Mavi Hat',39.9208,32.8541),
+        ('M3','Sıhhıye','Mavi Hat',39.9296,32.8595),('M4','Gar','Mavi Hat',39.9364,32.8423),
+        ('T1','Batıkent','Turuncu Hat',39.9684,32.7303),('T2','Demetevler','Turuncu Hat',39.9676,32.8027),
+        ('T3','Gar','Turuncu Hat',39.9364,32.8423),('T4','Keçiören','Turuncu Hat',39.9813,32.8647)
     ]
-    for idx, ad, hat in data:
-        metro.istasyon_ekle(idx, ad, hat)
+    for idx, ad, hat, enlem, boylam in data:
+        metro.istasyon_ekle(idx, ad, hat, enlem, boylam)
 
     # Bağlantıları ekle
     con = [
@@ -136,11 +1123,111 @@ if __name__ == '__main__':
     ]
     for a, b, s in con:
         metro.baglanti_ekle(a, b, s)
+    return metro
+
+def temizle_rota(rota: List[Istasyon]) -> List[Istasyon]:
+    """Ardışık aynı durak isimlerini (aktarma adımlarını) temizler."""
+    return [s for prev, s in zip([None] + rota, rota) if prev is None or s.ad != prev.ad]
+
+def istasyon_sec(metro: MetroAgi, soru: str, animasyon=None) -> Optional[Istasyon]:
+    """
+    Yazılan ada/öneke göre istasyon seçtirir; birden fazla aday varsa numara sorar.
+    Çıktı ve girdi animasyon üzerinden geçer; önceki rotanın animasyonu bu sırada sürebilir.
+    """
+    if animasyon is None:
+        from metro_animasyon import TrenAnimasyonu
+        animasyon = TrenAnimasyonu(etkin=False)
+    dizin = metro.istasyon_dizini()
+    while True:
+        metin = animasyon.girdi(soru).strip()
+        if not metin:
+            return None
+        adaylar = dizin.ara(metin)
+        if not adaylar:
+            animasyon.yaz("⚠️ Eşleşen istasyon yok, tekrar deneyin.")
+            continue
+        if len(adaylar) == 1 or adaylar[0] in dizin.tam_eslesme(metin):
+            secim = adaylar[0]
+        else:
+            for i, ad in enumerate(adaylar, 1):
+                animasyon.yaz(f"  {i}. {ad}")
+            try:
+                secim = adaylar[int(animasyon.girdi("🔹 Numara: ")) - 1]
+            except (ValueError, IndexError):
+                animasyon.yaz("⚠️ Geçersiz seçim, tekrar deneyin.")
+                continue
+        return metro.istasyonlar[secim][0]
+
+def terminal_menusu(metro: MetroAgi, animasyon=None):
+    """
+    Kullanıcıya interaktif terminal menüsü sunar.
+    İstasyon listesi basılmaz; ad yazılırken Tab ile önek tamamlama yapılır.
+    Önceki rotanın animasyonu yeni istasyonlar yazılırken sürer, sonuçlardan önce biter.
+    """
+    if animasyon is None:
+        from metro_animasyon import TrenAnimasyonu
+        animasyon = TrenAnimasyonu(etkin=False)
+    dizin = metro.istasyon_dizini()
+    try:
+        import readline
+        readline.set_completer(dizin.tamamla)
+        readline.set_completer_delims('')
+        readline.parse_and_bind('tab: complete')
+        if animasyon.etkin:
+            # Aday listesi de animasyon kilidiyle yazılsın; ardından istem ve yazılan metin yenilenir
+            readline.set_completion_display_matches_hook(
+                lambda _, adaylar, __: animasyon.yaz(
+                    '\n' + '  '.join(adaylar) + '\n' + animasyon.istem + readline.get_line_buffer(), son=''))
+    except ImportError:
+        pass
+    animasyon.yaz("\n🚇 Metro Simülasyonu — istasyon adını yazın (Tab: tamamla, boş: çıkış)")
+    while True:
+        animasyon.yaz("\n" + "─" * 70)
+        bas = istasyon_sec(metro, "🔹 Başlangıç: ", animasyon)
+        if bas is None:
+            break
+        hedef = istasyon_sec(metro, "🔹 Hedef: ", animasyon)
+        if hedef is None:
+            break
+        animasyon.iptal()  # yeni sonuçlardan önce önceki animasyon son karesiyle biter
+        az = metro.en_az_aktarma_bul(bas, hedef)
+        if az:
+            print("🛤️ En az aktarmalı:", metro.format_rota(temizle_rota(az)))
+        hiz, sure = metro.en_hizli_rota_bul(bas, hedef) or (None, None)
+        if hiz:
+            print(f"⏱️ En hızlı ({sure} dk):", metro.format_rota(temizle_rota(hiz)))
+            animasyon.goster(hiz)
+    animasyon.yaz("🚆 İyi yolculuklar! 🚆")
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Metro Rota Planlayıcı")
+    parser.add_argument('--toplu', nargs='?', const='-', metavar='DOSYA',
+                        help="NDJSON sorguları oku (varsayılan stdin), NDJSON sonuç yaz")
+    parser.add_argument('--isci', type=int, default=1, help="toplu modda paralel süreç sayısı")
+    parser.add_argument('--profil', nargs='?', const='profil', metavar='KLASOR',
+                        help="cProfile/tracemalloc raporlarını klasöre yaz (METRO_PROFIL ile aynı)")
+    args = parser.parse_args()
+    if args.profil:
+        os.environ['METRO_PROFIL'] = args.profil  # işçi süreçler de devralır
+    if args.toplu is not None:
+        # Toplu mod: loglama, renk ve animasyon yok
+        import metro_toplu
+        metro_toplu.main([args.toplu, '--isci', str(args.isci)])
+        sys.exit(0)
+
+    from metro_animasyon import TrenAnimasyonu
+
+    loglama_kur()
+
+    metro = ornek_ag()
+    animasyon = TrenAnimasyonu(renkler=RENKLER)  # TTY değilse kendiliğinden kapalı
 
     # Test senaryoları: farklı istasyonlar arası örnek rotalar
     print("\n=== Test Senaryoları ===")
     scenarios = [("AŞTİ", "OSB"), ("Batıkent", "Keçiören"), ("Keçiören", "AŞTİ")]
     for start, end in scenarios:
+        animasyon.iptal()
         start_station = metro.istasyonlar[start][0]
         end_station = metro.istasyonlar[end][0]
         az = metro.en_az_aktarma_bul(start_station, end_station)
@@ -150,4 +1237,7 @@ if __name__ == '__main__':
             print("🛤️ En az aktarmalı:", metro.format_rota(az))
         if hiz:
             print(f"⏱️ En hızlı ({sure} dk):", metro.format_rota(hiz))
-        animate_train()
+            animasyon.goster(hiz)
+    if sys.stdin.isatty():
+        terminal_menusu(metro, animasyon)
+    animasyon.kapat(bitir=True)
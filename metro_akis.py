@@ -0,0 +1,165 @@
+# metro_akis.py
+# Yolcu akışı ataması: başlangıç–varış (OD) talep matrisini en hızlı rotalara dağıtır.
+# En kısa yol ağaçlarının önceki-istasyon tabloları üzerinde NumPy scatter-add (np.add.at)
+# ile bağlantı ve istasyon yükleri biriktirilir. Kapasiteli denge modunda (MSA / Frank-Wolfe)
+# kalabalık bağlantıların süreleri iterasyonlar arasında BPR fonksiyonuyla artırılır.
+
+# Gerekli kütüphaneleri içe aktar
+import argparse
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ArzuBesiroglu_MetroSimulation import KompaktAg, MetroAgi, ornek_ag
+
+class AkisSonucu:
+    """Akış atamasının sonucu (diziler bağlantı ID / istasyon indeksi ile indekslenir)."""
+    def __init__(self, ag: KompaktAg, kenar_yuku, istasyon_yuku, kenar_suresi,
+                 karsilanamayan: float, iterasyon: int, bagil_bosluk: float):
+        self.ag = ag
+        self.kenar_yuku = kenar_yuku        # bağlantı ID -> yolcu
+        self.istasyon_yuku = istasyon_yuku  # istasyon indeksi -> istasyona uğrayan yolcu
+        self.kenar_suresi = kenar_suresi    # bağlantı ID -> son iterasyondaki süre
+        self.karsilanamayan = karsilanamayan  # rotası olmayan talep
+        self.iterasyon = iterasyon
+        self.bagil_bosluk = bagil_bosluk    # denge modunda yakınsama ölçüsü
+
+    def en_yuklu_baglantilar(self, n=10) -> List[Tuple[str, str, float]]:
+        """En yüklü n bağlantıyı (istasyon1, istasyon2, yük) olarak döndürür."""
+        satirlar = [(self.ag.idler[u], self.ag.idler[v], float(self.kenar_yuku[kid]))
+                    for kid, u, v, _ in self.ag.kenarlar]
+        return sorted(satirlar, key=lambda r: -r[2])[:n]
+
+def talep_matrisi(ag: KompaktAg, talepler: Dict[Tuple[str, str], float]) -> np.ndarray:
+    """{(başlangıç ID, hedef ID): yolcu} sözlüğünden yoğun OD matrisi üretir."""
+    talep = np.zeros((len(ag.idler), len(ag.idler)))
+    for (a, b), yolcu in talepler.items():
+        talep[ag.indeks[a], ag.indeks[b]] += yolcu
+    return talep
+
+def _agac_tablolari(ag: KompaktAg, kaynaklar, agirlik=None):
+    """
+    Her kaynak için en kısa yol ağacını tablolara döker.
+    Döndürür: (onceki, onceki_kenar, derinlik) — her biri (kaynak sayısı × n) int dizisi.
+    """
+    n = len(ag.idler)
+    onceki = np.full((len(kaynaklar), n), -1, dtype=np.int64)
+    onceki_kenar = np.full((len(kaynaklar), n), -1, dtype=np.int64)
+    derinlik = np.full((len(kaynaklar), n), -1, dtype=np.int64)
+    for r, s in enumerate(kaynaklar):
+        _, oc, ok, sira = ag.agac(s, agirlik=agirlik)
+        d = derinlik[r]
+        d[s] = 0
+        for v in sira[1:]:
+            d[v] = d[oc[v]] + 1
+        onceki[r] = oc
+        onceki_kenar[r] = ok
+    return onceki, onceki_kenar, derinlik
+
+def hepsi_ya_da_hic(ag: KompaktAg, talep: np.ndarray, agirlik=None) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Tüm talebi en hızlı rotalara atar (all-or-nothing).
+    Ağaçlar derinlik seviyelerine göre yapraklardan köke işlenir; her seviye
+    tek bir vektörel scatter-add ile ebeveynlere aktarılır.
+    Döndürür: (bağlantı yükü, istasyon yükü, karşılanamayan talep)
+    """
+    kenar_sayisi = max((kid for kid, _, _, _ in ag.kenarlar), default=-1) + 1
+    kaynaklar = np.flatnonzero(talep.sum(axis=1) > 0)
+    kenar_yuku = np.zeros(kenar_sayisi)
+    if len(kaynaklar) == 0:
+        return kenar_yuku, np.zeros(len(ag.idler)), 0.0
+    onceki, onceki_kenar, derinlik = _agac_tablolari(ag, kaynaklar, agirlik)
+
+    akis = talep[kaynaklar].astype(float)
+    ulasilamaz = derinlik < 0
+    karsilanamayan = float(akis[ulasilamaz].sum())
+    akis[ulasilamaz] = 0.0
+
+    # Derin seviyeden köke: yükü önceki istasyona ekle
+    r, c = np.nonzero(derinlik > 0)
+    d = derinlik[r, c]
+    sira = np.argsort(-d, kind='stable')
+    r, c, d = r[sira], c[sira], d[sira]
+    sinirlar = np.flatnonzero(np.diff(d)) + 1
+    for rs, cs in zip(np.split(r, sinirlar), np.split(c, sinirlar)):
+        np.add.at(akis, (rs, onceki[rs, cs]), akis[rs, cs])
+
+    # Her ağaç kenarının yükü, altındaki alt ağacın toplam akışıdır
+    np.add.at(kenar_yuku, onceki_kenar[r, c], akis[r, c])
+    istasyon_yuku = akis.sum(axis=0)
+    return kenar_yuku, istasyon_yuku, karsilanamayan
+
+def bpr_suresi(t0: np.ndarray, yuk: np.ndarray, kapasite: np.ndarray, alfa=0.15, beta=4.0) -> np.ndarray:
+    """BPR gecikme fonksiyonu: t = t0 * (1 + alfa * (yük / kapasite) ** beta)."""
+    return t0 * (1.0 + alfa * (yuk / kapasite) ** beta)
+
+def akis_ata(metro: MetroAgi, talep: np.ndarray, kapasite=None, yontem='hepsi_ya_da_hic',
+             iterasyon=50, tolerans=1e-4, alfa=0.15, beta=4.0, ag: Optional[KompaktAg] = None) -> AkisSonucu:
+    """
+    OD talebini ağa atar.
+    yontem: 'hepsi_ya_da_hic' (kapasitesiz), 'msa' (ardışık ortalamalar) veya
+            'fw' (Frank-Wolfe, ikiye bölme ile adım boyu)
+    kapasite: bağlantı başına kapasite (sayı ya da bağlantı ID ile indeksli dizi)
+    """
+    ag = ag or metro.kompakt()
+    kenar_sayisi = max((kid for kid, _, _, _ in ag.kenarlar), default=-1) + 1
+    t0 = np.zeros(kenar_sayisi)
+    for kid, _, _, sure in ag.kenarlar:
+        t0[kid] = sure
+
+    x, istasyon, karsilanamayan = hepsi_ya_da_hic(ag, talep)
+    if yontem == 'hepsi_ya_da_hic' or kapasite is None:
+        return AkisSonucu(ag, x, istasyon, t0, karsilanamayan, 1, 0.0)
+    kapasite = np.broadcast_to(np.asarray(kapasite, dtype=float), t0.shape)
+
+    def beckmann_turevi(adim, y):
+        # Amaç fonksiyonunun adım boyuna göre türevi: Σ t(x + λ(y - x)) · (y - x)
+        yon = y - x
+        return float(np.dot(bpr_suresi(t0, x + adim * yon, kapasite, alfa, beta), yon))
+
+    bosluk = float('inf')
+    k = 1
+    for k in range(1, iterasyon + 1):
+        t = bpr_suresi(t0, x, kapasite, alfa, beta)
+        y, istasyon_y, _ = hepsi_ya_da_hic(ag, talep, agirlik=t)
+        toplam = float(np.dot(t, x))
+        bosluk = (toplam - float(np.dot(t, y))) / toplam if toplam > 0 else 0.0
+        logging.debug(f"Denge iterasyonu {k}: bağıl boşluk {bosluk:.6f}")
+        if bosluk < tolerans:
+            break
+        if yontem == 'fw':
+            alt, ust = 0.0, 1.0
+            for _ in range(30):
+                orta = (alt + ust) / 2
+                if beckmann_turevi(orta, y) > 0:
+                    ust = orta
+                else:
+                    alt = orta
+            adim = (alt + ust) / 2
+        else:
+            adim = 1.0 / (k + 1)
+        x = x + adim * (y - x)
+        istasyon = istasyon + adim * (istasyon_y - istasyon)
+    return AkisSonucu(ag, x, istasyon, bpr_suresi(t0, x, kapasite, alfa, beta), karsilanamayan, k, bosluk)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Örnek ağ üzerinde rastgele OD talebiyle akış ataması")
+    parser.add_argument('--yontem', choices=['hepsi_ya_da_hic', 'msa', 'fw'], default='fw')
+    parser.add_argument('--kapasite', type=float, default=1000.0, help="bağlantı başına saatlik kapasite")
+    parser.add_argument('--yolcu', type=float, default=20000.0, help="toplam saatlik talep")
+    parser.add_argument('--tohum', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    metro = ornek_ag()
+    ag = metro.kompakt()
+    rng = np.random.default_rng(args.tohum)
+    talep = rng.random((len(ag.idler), len(ag.idler)))
+    np.fill_diagonal(talep, 0.0)
+    talep *= args.yolcu / talep.sum()
+
+    sonuc = akis_ata(metro, talep, kapasite=args.kapasite, yontem=args.yontem, ag=ag)
+    print(f"{args.yontem}: {sonuc.iterasyon} iterasyon, bağıl boşluk {sonuc.bagil_bosluk:.2e}")
+    for a, b, yuk in sonuc.en_yuklu_baglantilar():
+        print(f"{metro.istasyon_bul(a).ad:>12} ↔ {metro.istasyon_bul(b).ad:<12} {yuk:10.1f} yolcu")
@@ -0,0 +1,254 @@
+# metro_animasyon.py
+# Rota sorgularını bekletmeyen terminal tren animasyonu.
+# Animasyon ayrı bir iş parçacığında sabit kare bütçesiyle çalışır, yalnızca değişen
+# hücreleri yeniden çizer ve hesaplanan rotanın gerçek durak sürelerine göre ilerler.
+# Animasyon sürerken ana iş parçacığının çıktısı yaz()/girdi() üzerinden aynı kilitle
+# yazılır; böylece kareler metnin arasına girmez ve animasyon satırının imlece göre
+# yeri izlenir. TTY olmayan çıktılarda (dosya, boru, toplu mod) tamamen devre dışıdır.
+
+# Gerekli kütüphaneleri içe aktar
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Optional
+
+TREN = '🚆'   # terminalde iki sütun kaplar
+RAY = '─'
+DURAK = '●'
+SIFIRLA = '\033[0m'
+_ANSI = re.compile(r'\033\[[0-9;]*[A-Za-z]')
+
+def _genislik(metin: str) -> int:
+    """Metnin terminalde kapladığı sütun sayısı (geniş karakterler 2, birleşenler 0)."""
+    metin = _ANSI.sub('', metin)
+    return sum(0 if unicodedata.combining(c) or c == '\ufe0f'
+               else 2 if unicodedata.east_asian_width(c) in 'WF' else 1 for c in metin)
+
+class TrenAnimasyonu:
+    """
+    Arka planda çalışan tren animasyonu.
+    goster() hemen döner; yeni bir goster() ya da iptal() çalışan animasyonu
+    en fazla bir kare içinde durdurur ve son kareyi çizer. goster() bulunulan satırı
+    animasyona, altındakini boş koruma satırına ayırır. Animasyon sürerken ana iş
+    parçacığı çıktıyı yaz() ile, kullanıcı girdisini girdi() ile almalıdır: ikisi de
+    karelerle aynı kilidi alır ve animasyon satırının imlece uzaklığını günceller.
+    """
+    def __init__(self, akis=None, fps=30, dakika_saniye=0.1, en_uzun=3.0, genislik=40,
+                 renkler: Optional[Dict[str, str]] = None, etkin: Optional[bool] = None):
+        self.akis = akis or sys.stdout
+        self.kare_butcesi = 1.0 / fps
+        self.dakika_saniye = dakika_saniye  # rotadaki 1 dakikanın animasyondaki karşılığı (sn)
+        self.en_uzun = en_uzun              # tek animasyonun üst süresi (sn)
+        self.genislik = genislik
+        self.renkler = renkler or {}
+        if etkin is None:
+            etkin = self.akis.isatty() and os.environ.get('TERM') != 'dumb'
+        self.etkin = etkin
+        self._kosul = threading.Condition()
+        self._yazma = threading.Lock()
+        self._is = None        # (nesil, hücre şablonu, durak sütunları, kümülatif süreler, etiket)
+        self._nesil = 0
+        self._ciziyor = False
+        self._kapali = False
+        self._thread: Optional[threading.Thread] = None
+        # Aşağıdakiler _yazma kilidiyle korunur
+        self._satir = 0        # animasyon satırı imlecin kaç satır üstünde
+        self._sutun = 0        # imlecin sütunu (satır kaydırmayı hesaplamak için)
+        self._cizilen: Optional[List[str]] = None  # ekrandaki son kare; None = tam çizim
+        self.istem = ''        # girdi() ile en son gösterilen istem
+
+    def goster(self, rota):
+        """Rotanın animasyonunu başlatır ve beklemeden döner."""
+        if not self.etkin or len(rota) < 2:
+            return
+        kumulatif = [0]
+        for a, b in zip(rota, rota[1:]):
+            kumulatif.append(kumulatif[-1] + min(t for nbr, t in a.komsular if nbr is b))
+        toplam = kumulatif[-1] or 1
+        sutun = [round(k / toplam * (self.genislik - 2)) for k in kumulatif]
+        sablon = [RAY] * self.genislik
+        for i in range(len(rota) - 1):
+            renk = self.renkler.get(rota[i + 1].hat, '')
+            for c in range(sutun[i], sutun[i + 1]):
+                sablon[c] = f"{renk}{RAY}{SIFIRLA}" if renk else RAY
+        for ist, c in zip(rota, sutun):
+            renk = self.renkler.get(ist.hat, '')
+            sablon[c] = f"{renk}{DURAK}{SIFIRLA}" if renk else DURAK
+        etiket = f" {rota[0].ad} → {rota[-1].ad}"
+        self.iptal()
+        with self._yazma:
+            self.akis.write('\n\n')  # animasyon satırı + koruma satırı
+            self.akis.flush()
+            self._satir, self._sutun, self._cizilen = 2, 0, None
+        with self._kosul:
+            self._nesil += 1
+            self._is = (self._nesil, sablon, kumulatif, etiket)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dongu, name='tren-animasyonu', daemon=True)
+                self._thread.start()
+            self._kosul.notify_all()
+
+    def iptal(self):
+        """Çalışan animasyonu durdurur (en fazla bir kare bekler) ve son karesini çizer."""
+        if not self.etkin:
+            return
+        with self._kosul:
+            calisan = self._is
+            self._nesil += 1
+            self._is = None
+            self._kosul.notify_all()
+            while self._ciziyor:
+                self._kosul.wait()
+        if calisan is not None:
+            _, sablon, kumulatif, etiket = calisan
+            self._ciz(self._kare(sablon, kumulatif, etiket, 1.0))
+
+    def yaz(self, metin: str = '', son: str = '\n'):
+        """Ana iş parçacığı çıktısı: karelerle aynı kilitle yazar, animasyon satırının yerini izler."""
+        metin = f"{metin}{son}"
+        with self._yazma:
+            self.akis.write(metin)
+            self.akis.flush()
+            if self.etkin:
+                self._ilerle(metin)
+
+    def girdi(self, soru: str) -> str:
+        """
+        input() karşılığı. Animasyon sürüyorsa istem yazılırken kareler bekletilir
+        (readline varsa istem ekrana geldiğinde çağrılan kancayla) ve Enter'ın açtığı
+        yeni satır hesaba katılır.
+        """
+        self.istem = soru
+        if not self.etkin or self._is is None:
+            return input(soru)
+        readline = sys.modules.get('readline')
+        kilitli = True
+
+        def istem_yazildi():
+            nonlocal kilitli
+            if kilitli:
+                self._ilerle(soru)
+                kilitli = False
+                self._yazma.release()
+
+        self._yazma.acquire()
+        try:
+            if readline is None:
+                self.akis.write(soru)
+                self.akis.flush()
+                istem_yazildi()
+                cevap = input()
+            else:
+                readline.set_pre_input_hook(istem_yazildi)
+                cevap = input(soru)
+        finally:
+            if readline is not None:
+                readline.set_pre_input_hook()
+            istem_yazildi()
+        with self._yazma:
+            self._ilerle(cevap + '\n')
+            # Enter ile bu kayıt arasında çizilen bir kare koruma satırına düşmüş olabilir
+            if 0 < self._satir - 1 < self._satir_siniri():
+                self.akis.write(f"\0337\033[{self._satir - 1}A\r\033[2K\0338")
+                self.akis.flush()
+            self._cizilen = None
+        return cevap
+
+    def _ilerle(self, metin: str):
+        """Yazılan metnin imleci kaç satır aşağı taşıdığını hesaplar (_yazma kilidi altında)."""
+        genislik = shutil.get_terminal_size().columns
+        for i, parca in enumerate(metin.split('\n')):
+            if i:
+                self._satir += 1
+                self._sutun = 0
+            w = self._sutun + _genislik(parca)
+            if w > genislik:
+                self._satir += (w - 1) // genislik
+                w -= (w - 1) // genislik * genislik
+            self._sutun = w
+
+    def _satir_siniri(self) -> int:
+        """Bu uzaklıktaki satır ekrandan kaymıştır; çizilmez."""
+        return shutil.get_terminal_size().lines
+
+    def kapat(self, bitir=False):
+        """İş parçacığını sonlandırır; bitir=True ise son animasyonun tamamlanmasını bekler."""
+        if self._thread is None:
+            return
+        if not bitir:
+            self.iptal()
+        with self._kosul:
+            if bitir:
+                while self._is is not None or self._ciziyor:
+                    self._kosul.wait()
+            self._kapali = True
+            self._nesil += 1
+            self._kosul.notify_all()
+        self._thread.join()
+        self._thread = None
+
+    def _dongu(self):
+        """Arka plan döngüsü: sıradaki işi alır ve oynatır."""
+        while True:
+            with self._kosul:
+                while self._is is None and not self._kapali:
+                    self._kosul.wait()
+                if self._kapali:
+                    return
+                nesil, sablon, kumulatif, etiket = self._is
+                self._ciziyor = True
+            try:
+                self._oynat(nesil, sablon, kumulatif, etiket)
+            finally:
+                with self._kosul:
+                    self._ciziyor = False
+                    if self._is is not None and self._is[0] == nesil:
+                        self._is = None
+                    self._kosul.notify_all()
+
+    def _oynat(self, nesil, sablon: List[str], kumulatif: List[int], etiket: str):
+        """Kare bütçesine uyarak treni rota boyunca ilerletir."""
+        toplam = kumulatif[-1]
+        sure = min(self.en_uzun, max(self.kare_butcesi, toplam * self.dakika_saniye))
+        baslangic = time.perf_counter()
+        while self._nesil == nesil:
+            oran = min(1.0, (time.perf_counter() - baslangic) / sure)
+            self._ciz(self._kare(sablon, kumulatif, etiket, oran))
+            if oran >= 1.0:
+                return
+            kalan = self.kare_butcesi - (time.perf_counter() - baslangic) % self.kare_butcesi
+            time.sleep(kalan)
+
+    def _kare(self, sablon: List[str], kumulatif: List[int], etiket: str, oran: float) -> List[str]:
+        """Trenin rotanın 'oran' kadarını geçtiği karenin hücreleri."""
+        toplam = kumulatif[-1]
+        hucreler = list(sablon)
+        c = min(round(oran * (self.genislik - 2)), self.genislik - 2)
+        hucreler[c], hucreler[c + 1] = TREN, ''
+        hucreler.extend(f"{etiket}  {round(oran * toplam):>3}/{toplam} dk")
+        return hucreler
+
+    def _ciz(self, hucreler: List[str]):
+        """Animasyon satırına yalnızca değişen hücre aralığını yazar (gerekirse satırı baştan çizer)."""
+        with self._yazma:
+            if not 0 < self._satir < self._satir_siniri():
+                return
+            onceki = self._cizilen
+            if onceki is None:
+                ilk, parca, temizle = 0, ''.join(hucreler), '\033[2K'
+            else:
+                n = max(len(onceki), len(hucreler))
+                farkli = [i for i in range(n) if i >= len(onceki) or i >= len(hucreler) or onceki[i] != hucreler[i]]
+                if not farkli:
+                    return
+                ilk, son = farkli[0], farkli[-1]
+                parca = ''.join(hucreler[ilk:son + 1]) + ' ' * max(0, son + 1 - len(hucreler))
+                temizle = ''
+            hareket = f"\033[{ilk}C" if ilk else ''
+            self.akis.write(f"\0337\033[{self._satir}A\r{temizle}{hareket}{parca}\0338")
+            self.akis.flush()
+            self._cizilen = hucreler
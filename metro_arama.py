@@ -0,0 +1,105 @@
+# metro_arama.py
+# İstasyon adı arama dizini: önek ağacı (trie) + aksan duyarsız üçlü (trigram) eşleştirme.
+# "Sıhhıye" / "Sıhhiye" / "sihhiye" ve "AŞTİ" / "asti" aynı kabul edilir.
+# Dizin ağ yüklendiğinde bir kez kurulur; sorgular yalnızca yazılan önek kadar yürür.
+
+# Gerekli kütüphaneleri içe aktar
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Türkçe harfler için aksan eşlemesi (NFKD ile ayrışmayanlar dahil)
+_TR_ESLEME = str.maketrans({'ı': 'i', 'İ': 'i', 'I': 'i', 'ş': 's', 'Ş': 's', 'ğ': 'g', 'Ğ': 'g',
+                            'ç': 'c', 'Ç': 'c', 'ö': 'o', 'Ö': 'o', 'ü': 'u', 'Ü': 'u'})
+
+def normallestir(metin: str) -> str:
+    """Küçük harfe çevirir, Türkçe harfleri ve aksanları sadeleştirir."""
+    metin = metin.translate(_TR_ESLEME).casefold()
+    metin = unicodedata.normalize('NFKD', metin)
+    return ' '.join(''.join(c for c in metin if not unicodedata.combining(c)).split())
+
+def _uclular(metin: str) -> Set[str]:
+    """Kenarları boşlukla doldurulmuş metnin üçlülerini döndürür."""
+    metin = f"  {metin} "
+    return {metin[i:i + 3] for i in range(len(metin) - 2)}
+
+class IstasyonDizini:
+    """
+    İstasyon adları için önek ve bulanık arama dizini.
+    Her trie düğümü, o öneki taşıyan adların sıralı listesini saklar;
+    böylece önek araması yalnızca önek uzunluğu kadar adım sürer.
+    """
+    def __init__(self, adlar: Iterable[str]):
+        self.adlar = sorted(set(adlar))
+        self._normal: Dict[str, str] = {ad: normallestir(ad) for ad in self.adlar}
+        self._trie: Dict = {}
+        self._uclu_dizini: Dict[str, List[str]] = defaultdict(list)
+        self._tam: Dict[str, List[str]] = defaultdict(list)  # normal ad -> adlar
+        kumeler: Dict[int, Set[str]] = defaultdict(set)
+        for ad, normal in self._normal.items():
+            self._tam[normal].append(ad)
+            # Tam adın ve her kelimenin başlangıcı önek olarak aranabilir
+            baslangiclar = {0} | {i + 1 for i, c in enumerate(normal) if c == ' '}
+            for bas in baslangiclar:
+                dugum = self._trie
+                for c in normal[bas:]:
+                    dugum = dugum.setdefault(c, {})
+                    kumeler[id(dugum)].add(ad)
+            for uclu in _uclular(normal):
+                self._uclu_dizini[uclu].append(ad)
+        self._dugum_adlari(self._trie, kumeler)
+
+    def _dugum_adlari(self, dugum: Dict, kumeler: Dict[int, Set[str]]):
+        """Her düğüme adlarını kısa/alfabetik sırada '' anahtarıyla yerleştirir."""
+        yigin = [dugum]
+        while yigin:
+            d = yigin.pop()
+            for c, cocuk in d.items():
+                yigin.append(cocuk)
+            if d is not self._trie:
+                d[''] = sorted(kumeler[id(d)], key=lambda ad: (len(ad), ad))
+
+    def onek_ara(self, onek: str, limit: int = 10) -> List[str]:
+        """Normalleştirilmiş öneki taşıyan adları döndürür."""
+        dugum = self._trie
+        for c in normallestir(onek):
+            dugum = dugum.get(c)
+            if dugum is None:
+                return []
+        return list(dugum.get('', self.adlar))[:limit]
+
+    def bulanik_ara(self, sorgu: str, limit: int = 10, esik: float = 0.3) -> List[Tuple[str, float]]:
+        """Üçlü benzerliğine (Dice katsayısı) göre en yakın adları döndürür."""
+        uclular = _uclular(normallestir(sorgu))
+        ortak: Dict[str, int] = defaultdict(int)
+        for uclu in uclular:
+            for ad in self._uclu_dizini.get(uclu, ()):
+                ortak[ad] += 1
+        skorlar = []
+        for ad, n in ortak.items():
+            skor = 2 * n / (len(uclular) + len(_uclular(self._normal[ad])))
+            if skor >= esik:
+                skorlar.append((ad, skor))
+        skorlar.sort(key=lambda r: (-r[1], r[0]))
+        return skorlar[:limit]
+
+    def tam_eslesme(self, sorgu: str) -> List[str]:
+        """Normalleştirilmiş hâli sorguyla birebir aynı olan adlar."""
+        return list(self._tam.get(normallestir(sorgu), ()))
+
+    def ara(self, sorgu: str, limit: int = 10) -> List[str]:
+        """Önce tam/önek eşleşmeleri, ardından bulanık eşleşmeler."""
+        sonuc = self.tam_eslesme(sorgu)
+        for ad in self.onek_ara(sorgu, limit):
+            if ad not in sonuc:
+                sonuc.append(ad)
+        if len(sonuc) < limit:
+            for ad, _ in self.bulanik_ara(sorgu, limit):
+                if ad not in sonuc:
+                    sonuc.append(ad)
+        return sonuc[:limit]
+
+    def tamamla(self, metin: str, durum: int):
+        """readline tamamlayıcısı: durum'uncu öneriyi ya da None döndürür."""
+        adaylar = self.onek_ara(metin, limit=50)
+        return adaylar[durum] if durum < len(adaylar) else None
@@ -0,0 +1,102 @@
+# metro_baslangic.py
+# Soğuk açılış ölçümü: motoru ve kısa CLI çağrılarını ayrı Python süreçlerinde başlatıp
+# boş yorumlayıcıya göre ek süreyi ölçer, bütçe aşılırsa 1 ile çıkar. Ayrıca içe aktarmanın
+# yan etkisiz olduğunu (çıktı yok, loglama ayarı yok, ağır isteğe bağlı modüller yüklenmemiş)
+# doğrular. Süreler, geçici bir -X pycache_prefix dizinine önceden derlenmiş bayt koduyla
+# ölçülür; böylece PYTHONDONTWRITEBYTECODE=1 ya da yazılamayan klasörlerde de ölçüme
+# derleme süresi karışmaz ve depoya __pycache__ yazılmaz.
+#
+#   python metro_baslangic.py --tekrar 15 --ice-aktarma-butcesi 60 --toplu-butcesi 150
+
+# Gerekli kütüphaneleri içe aktar
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+KLASOR = os.path.dirname(os.path.abspath(__file__))
+BETIK = os.path.join(KLASOR, 'ArzuBesiroglu_MetroSimulation.py')
+
+# İçe aktarmada yüklenmemesi gereken isteğe bağlı alt sistemler
+AGIR_MODULLER = ('numpy', 'metro_animasyon', 'metro_arama', 'metro_mekan', 'metro_profil',
+                 'concurrent.futures', 'multiprocessing', 'json', 'argparse')
+
+YAN_ETKI_KODU = f"""
+import json, logging, sys
+import ArzuBesiroglu_MetroSimulation
+print(json.dumps({{
+    'isleyiciler': len(logging.root.handlers),
+    'yuklu': [m for m in {AGIR_MODULLER!r} if m in sys.modules and m != 'json'],
+}}))
+"""
+
+def _sure(komut: List[str], girdi: str = '', tekrar: int = 15, ortam=None) -> float:
+    """Komutun medyan duvar saati süresi (ms); ilk (ısınma) çalıştırma sayılmaz."""
+    sureler = []
+    for i in range(tekrar + 1):
+        t0 = time.perf_counter()
+        subprocess.run(komut, input=girdi, text=True, cwd=KLASOR, check=True, env=ortam,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if i:
+            sureler.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(sureler)
+
+def bayt_kodu_hazirla(onbellek: str) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Depoyu onbellek dizinine derler; ölçülecek süreçler için (python komutu, ortam) döndürür.
+    Standart kütüphanenin bayt kodu ısınma çalıştırmasında aynı dizine yazılır.
+    """
+    python = [sys.executable, '-X', f'pycache_prefix={onbellek}']
+    ortam = {k: v for k, v in os.environ.items() if k not in ('PYTHONDONTWRITEBYTECODE', 'PYTHONPYCACHEPREFIX')}
+    subprocess.run(python + ['-m', 'compileall', '-q', '-l', KLASOR], cwd=KLASOR, env=ortam, check=True,
+                   stdout=subprocess.DEVNULL)
+    return python, ortam
+
+def yan_etkiler() -> List[str]:
+    """İçe aktarmanın yan etkilerini listeler (boş liste = yan etkisiz)."""
+    sonuc = subprocess.run([sys.executable, '-c', YAN_ETKI_KODU], cwd=KLASOR, text=True,
+                           capture_output=True, check=True)
+    satirlar = sonuc.stdout.strip().splitlines()
+    veri = json.loads(satirlar[-1])
+    sorunlar = []
+    if len(satirlar) > 1 or sonuc.stderr:
+        sorunlar.append("içe aktarma çıktı üretiyor")
+    if veri['isleyiciler']:
+        sorunlar.append("içe aktarma loglamayı ayarlıyor")
+    if veri['yuklu']:
+        sorunlar.append(f"içe aktarmada yüklenen isteğe bağlı modüller: {', '.join(veri['yuklu'])}")
+    return sorunlar
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Soğuk açılış süresi ölçümü")
+    parser.add_argument('--tekrar', type=int, default=15)
+    parser.add_argument('--ice-aktarma-butcesi', type=float, default=60.0, help="ms, boş yorumlayıcıya ek")
+    parser.add_argument('--toplu-butcesi', type=float, default=150.0, help="ms, tek sorguluk --toplu çağrısı için")
+    args = parser.parse_args()
+
+    sorgu = json.dumps({'id': 1, 'bas': 'AŞTİ', 'hedef': 'OSB'}, ensure_ascii=False) + '\n'
+    with tempfile.TemporaryDirectory(prefix='metro_pyc_') as onbellek:
+        python, ortam = bayt_kodu_hazirla(onbellek)
+        bos = _sure(python + ['-c', 'pass'], tekrar=args.tekrar, ortam=ortam)
+        ice_aktarma = _sure(python + ['-c', 'import ArzuBesiroglu_MetroSimulation'],
+                            tekrar=args.tekrar, ortam=ortam) - bos
+        toplu = _sure(python + [BETIK, '--toplu'], girdi=sorgu, tekrar=args.tekrar, ortam=ortam) - bos
+
+    sorunlar = yan_etkiler()
+    if ice_aktarma > args.ice_aktarma_butcesi:
+        sorunlar.append(f"içe aktarma bütçeyi aşıyor ({ice_aktarma:.1f} > {args.ice_aktarma_butcesi:.0f} ms)")
+    if toplu > args.toplu_butcesi:
+        sorunlar.append(f"toplu sorgu bütçeyi aşıyor ({toplu:.1f} > {args.toplu_butcesi:.0f} ms)")
+
+    print(f"Boş yorumlayıcı      : {bos:7.1f} ms")
+    print(f"İçe aktarma (ek)     : {ice_aktarma:7.1f} ms  (bütçe {args.ice_aktarma_butcesi:.0f})")
+    print(f"Tek sorgu --toplu (ek): {toplu:7.1f} ms  (bütçe {args.toplu_butcesi:.0f})")
+    for sorun in sorunlar:
+        print("✗", sorun)
+    print("GEÇTİ" if not sorunlar else "KALDI")
+    sys.exit(0 if not sorunlar else 1)
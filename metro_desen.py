@@ -0,0 +1,182 @@
+# metro_desen.py
+# Aktarma deseni (transfer pattern) ön hesaplaması.
+# Her başlangıç istasyonu için, her hedefe giden en hızlı rotanın aktarma deseni
+# (hat değiştirilen ara istasyonların sırası) saklanır. Sorgu anında desen, hat içi
+# önek toplamları ve doğrudan aktarma bağlantılarıyla değerlendirilir; graf araması yapılmaz.
+# Desenler ortak bir tabloda tekilleştirilir, JSON'a yazılabilir ve bağlantı değişikliklerinde
+# yalnızca etkilenen başlangıç istasyonları için yeniden hesaplanır. İstasyon indeksi yalnızca
+# istasyon eklenince, ağırlıklı kompakt ağ ise yalnızca kirli bir kaynak yeniden hesaplanırken kurulur.
+
+# Gerekli kütüphaneleri içe aktar
+import argparse
+import json
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from ArzuBesiroglu_MetroSimulation import Istasyon, KompaktAg, MetroAgi, ornek_ag
+
+class AktarmaDesenleri:
+    """
+    Başlangıç istasyonu başına optimal aktarma desenleri.
+    desenler[no]: ara düğüm ID'leri (başlangıç ve hedef hariç)
+    kaynaklar[bas ID][hedef indeksi]: desen no (-1 = ulaşılamaz)
+    """
+    def __init__(self, metro: MetroAgi):
+        self.metro = metro
+        self.desenler: List[Tuple[str, ...]] = []
+        self._desen_no: Dict[Tuple[str, ...], int] = {}
+        self.kaynaklar: Dict[str, List[int]] = {}
+        self._kirli: Set[str] = set()
+        self._kenar_kaynaklari: Dict[int, Set[str]] = defaultdict(set)  # bağlantı ID -> ağacında kullanan kaynaklar
+        self._kaynak_kenarlari: Dict[str, List[int]] = {}
+        self._kenarsiz: Set[str] = set()  # dosyadan yüklenen, ağaç kenarı bilinmeyen kaynaklar
+        self._ag: Optional[KompaktAg] = None  # ağırlıklı görünüm; her bağlantı değişikliğinde eskir
+        self._idler: List[str] = []          # indeks -> istasyon ID (yalnızca istasyon eklenince değişir)
+        self._indeks: Dict[str, int] = {}
+        self._istler: List[Istasyon] = []
+        metro.degisiklik_dinleyicisi_ekle(self._degisiklik)
+
+    def _degisiklik(self, b, eski, yeni):
+        """Bağlantı değişikliğinde etkilenen kaynakları kirli işaretler (ağ tembelce yeniden kurulur)."""
+        self._ag = None
+        if eski is not None and (yeni is None or yeni > eski):
+            # Süre arttı/kapandı: yalnızca en kısa yol ağacında bu bağlantı olan kaynaklar
+            self._kirli |= self._kenar_kaynaklari.get(b.kid, set()) | self._kenarsiz
+        else:
+            # Yeni/kısalan bağlantı herhangi bir kaynağın desenini iyileştirebilir
+            self._kirli = set(self.kaynaklar)
+
+    def _kompakt(self) -> KompaktAg:
+        """Güncel süreli kompakt ağ; yalnızca kaynak yeniden hesaplanırken kurulur."""
+        if self._ag is None or len(self._ag.idler) != self.metro.istasyon_sayisi():
+            self._ag = self.metro.kompakt()
+        if len(self._idler) != len(self._ag.idler):
+            self._idler, self._indeks = self._ag.idler, self._ag.indeks
+            self._istler = [self.metro.istasyon_bul(idx) for idx in self._idler]
+        return self._ag
+
+    def _dizin(self) -> Dict[str, int]:
+        """İstasyon ID -> indeks; ağ yalnızca istasyon eklendiyse kurulur."""
+        if len(self._idler) != self.metro.istasyon_sayisi():
+            self._kompakt()
+        return self._indeks
+
+    def _intern(self, cekirdek: Tuple[str, ...]) -> int:
+        """Deseni ortak tabloya ekler (varsa mevcut numarasını döndürür)."""
+        no = self._desen_no.get(cekirdek)
+        if no is None:
+            no = len(self.desenler)
+            self.desenler.append(cekirdek)
+            self._desen_no[cekirdek] = no
+        return no
+
+    def hesapla(self, kaynaklar=None):
+        """Verilen (varsayılan: tüm) başlangıç istasyonları için desenleri hesaplar."""
+        self._dizin()
+        for idx in (kaynaklar if kaynaklar is not None else list(self._idler)):
+            self._kaynak_hesapla(idx)
+
+    def _kaynak_hesapla(self, idx: str):
+        """
+        Tek kaynaktan Dijkstra ağacı kurar; her hedefin deseni ebeveyninin
+        deseninden türetilir: hat değişmiyorsa aynen, değişiyorsa ebeveyn eklenerek.
+        """
+        ag = self._kompakt()
+        istler = self._istler
+        s = ag.indeks[idx]
+        _, onceki, onceki_kenar, sira = ag.agac(s)
+        cekirdek: List[Optional[Tuple[str, ...]]] = [None] * len(ag.idler)
+        giris_hatti: List[Optional[str]] = [None] * len(ag.idler)  # düğüme gelen adımın hattı (aktarmada None)
+        cekirdek[s] = ()
+        for kid in self._kaynak_kenarlari.pop(idx, ()):
+            self._kenar_kaynaklari[kid].discard(idx)
+        kenarlar = []
+        for v in sira[1:]:
+            p = onceki[v]
+            hat = istler[v].hat if istler[p].hat == istler[v].hat else None
+            if p == s or (hat is not None and giris_hatti[p] == hat):
+                cekirdek[v] = cekirdek[p]
+            else:
+                cekirdek[v] = cekirdek[p] + (ag.idler[p],)
+            giris_hatti[v] = hat
+            kenarlar.append(onceki_kenar[v])
+            self._kenar_kaynaklari[onceki_kenar[v]].add(idx)
+        self._kaynak_kenarlari[idx] = kenarlar
+        self._kenarsiz.discard(idx)
+        self.kaynaklar[idx] = [-1 if c is None else self._intern(c) for c in cekirdek]
+        self._kirli.discard(idx)
+
+    def _degerlendir(self, dugumler: List[Istasyon]) -> Optional[int]:
+        """Deseni doğrudan hat/aktarma aramalarıyla değerlendirir; geçersizse None."""
+        toplam = 0
+        for a, b in zip(dugumler, dugumler[1:]):
+            if a.hat == b.hat:
+                t = self.metro.hat_ici_sure(a, b)
+            else:
+                t = min((t for nbr, t in a.komsular if nbr is b), default=None)
+            if t is None:
+                return None
+            toplam += t
+        return toplam
+
+    def rota_bul(self, bas: Istasyon, hedef: Istasyon):
+        """Desen tablosundan en hızlı rotayı (rota, süre) olarak döndürür."""
+        if bas.idx in self._kirli or bas.idx not in self.kaynaklar:
+            self._kaynak_hesapla(bas.idx)
+        j = self._dizin().get(hedef.idx)
+        tablo = self.kaynaklar[bas.idx]
+        if j is None or j >= len(tablo) or tablo[j] < 0:
+            return None
+        dugumler = [bas] + [self.metro.istasyon_bul(x) for x in self.desenler[tablo[j]]] + [hedef]
+        sure = self._degerlendir(dugumler)
+        if sure is None:
+            # Doğrusal olmayan hat vb.: desen değerlendirilemiyor, graf aramasına dön
+            return self.metro.en_hizli_rota_bul(bas, hedef)
+        rota = [bas]
+        for a, b in zip(dugumler, dugumler[1:]):
+            rota.extend(self.metro.hat_kesiti(a, b) if a.hat == b.hat else [b])
+        return rota, sure
+
+    def kaydet(self) -> Dict:
+        """Desen tablosunu JSON'a yazılabilir sözlük olarak döndürür."""
+        self.hesapla(sorted(self._kirli))
+        return {
+            'istasyonlar': list(self._idler),
+            'desenler': [list(d) for d in self.desenler],
+            'kaynaklar': self.kaynaklar,
+        }
+
+    @classmethod
+    def yukle(cls, metro: MetroAgi, veri: Dict) -> 'AktarmaDesenleri':
+        """kaydet() çıktısından desenleri yükler; istasyon sırası farklıysa yeniden hesaplar."""
+        desenler = cls(metro)
+        desenler._dizin()
+        if veri['istasyonlar'] != desenler._idler:
+            logging.warning("Desen dosyası bu ağa ait değil, desenler yeniden hesaplanıyor")
+            desenler.hesapla()
+            return desenler
+        for cekirdek in veri['desenler']:
+            desenler._intern(tuple(cekirdek))
+        desenler.kaynaklar = {idx: list(tablo) for idx, tablo in veri['kaynaklar'].items()}
+        # Ağaç kenarı kullanımı dosyada tutulmaz: bu kaynaklar her süre artışında yenilenir
+        desenler._kenarsiz = set(desenler.kaynaklar)
+        return desenler
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Örnek ağ için aktarma desenlerini hesaplar")
+    parser.add_argument('-o', '--cikti', default='aktarma_desenleri.json')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    metro = ornek_ag()
+    t0 = time.perf_counter()
+    desenler = AktarmaDesenleri(metro)
+    desenler.hesapla()
+    with open(args.cikti, 'w', encoding='utf-8') as f:
+        json.dump(desenler.kaydet(), f, ensure_ascii=False)
+    print(f"{len(desenler.kaynaklar)} kaynak, {len(desenler.desenler)} tekil desen "
+          f"({time.perf_counter() - t0:.3f} sn) → {args.cikti}")
+    rota, sure = desenler.rota_bul(metro.istasyonlar['AŞTİ'][0], metro.istasyonlar['OSB'][0])
+    print(f"AŞTİ → OSB ({sure} dk):", metro.format_rota(rota))
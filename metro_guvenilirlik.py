@@ -0,0 +1,172 @@
+# metro_guvenilirlik.py
+# Monte Carlo seyahat süresi güvenilirliği.
+# Her bağlantıya bir süre dağılımı atanır; binlerce senaryo tek seferde
+# (örnek × bağlantı ID) NumPy matrisi olarak örneklenir. Bir rotanın tüm senaryolardaki
+# süresi, rotanın bağlantı sütunlarının toplamıdır; p50/p90/p99 bu vektörden okunur.
+# Aday rotalar aynı örneklerle (ortak rastgele sayılar) karşılaştırıldığı için
+# "en güvenilir rota" seçimi örnekleme gürültüsünden az etkilenir.
+
+# Gerekli kütüphaneleri içe aktar
+import argparse
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ArzuBesiroglu_MetroSimulation import Istasyon, MetroAgi, ornek_ag, temizle_rota
+
+# Desteklenen dağılımlar ve parametreleri (süre = bağlantının nominal süresi):
+#   ('sabit',)                           -> süre
+#   ('lognormal', sigma)                 -> süre * exp(sigma * Z), medyan = süre
+#   ('ucgen', alt, tepe, ust)            -> süre * Üçgen(alt, tepe, ust) çarpanı
+#   ('gecikme', olasilik, ek_dakika)     -> süre + (olasılıkla) Üstel(ortalama ek_dakika)
+DAGILIMLAR = ('sabit', 'lognormal', 'ucgen', 'gecikme')
+YUZDELIKLER = (50, 90, 99)
+
+class GuvenilirlikModeli:
+    """
+    Bağlantı süresi dağılımları ve örnek matrisi.
+    Örnekler ilk kullanımda üretilir; ağa bağlantı eklenirse matrise yeni sütun eklenir,
+    bir bağlantının süresi ya da dağılımı değişirse yalnızca onun sütunu yeniden örneklenir.
+    """
+    def __init__(self, metro: MetroAgi, ornek_sayisi: int = 10000,
+                 varsayilan: Tuple = ('lognormal', 0.1), tohum: Optional[int] = 0):
+        if varsayilan[0] not in DAGILIMLAR:
+            raise ValueError(f"bilinmeyen dağılım: {varsayilan[0]}")
+        self.metro = metro
+        self.ornek_sayisi = ornek_sayisi
+        self.varsayilan = varsayilan
+        self.tohum = tohum
+        self.dagilimlar: Dict[int, Tuple] = {}  # bağlantı ID -> dağılım (yoksa varsayılan)
+        self._ornekler: Optional[np.ndarray] = None
+        self._rng: Optional[np.random.Generator] = None
+        metro.degisiklik_dinleyicisi_ekle(self._degisiklik)
+
+    def _degisiklik(self, b, eski, yeni):
+        """Yeni bağlantıya sütun ekler, süresi değişenin sütununu yeniler (kapanma/açılma: sütun geçerli)."""
+        if self._ornekler is None or yeni is None or yeni == eski:
+            return
+        eksik = b.kid + 1 - self._ornekler.shape[1]
+        if eksik > 0:
+            self._ornekler = np.hstack([self._ornekler, np.empty((self.ornek_sayisi, eksik))])
+        self._sutun_yenile(b.kid)
+
+    def dagilim_ata(self, kid: int, tur: str, *parametreler):
+        """Bağlantıya süre dağılımı atar (bkz. DAGILIMLAR)."""
+        if tur not in DAGILIMLAR:
+            raise ValueError(f"bilinmeyen dağılım: {tur}")
+        self.dagilimlar[kid] = (tur,) + parametreler
+        if self._ornekler is not None:
+            self._sutun_yenile(kid)
+
+    def _ornekle(self, dagilim: Tuple, sure: np.ndarray) -> np.ndarray:
+        """Nominal süreleri 'sure' olan sütunlar için (ornek_sayisi × len(sure)) örnek üretir."""
+        tur, *p = dagilim
+        rng = self._rng
+        n, m = self.ornek_sayisi, len(sure)
+        if tur == 'sabit':
+            return np.broadcast_to(sure, (n, m))
+        if tur == 'lognormal':
+            return sure * np.exp(p[0] * rng.standard_normal((n, m)))
+        if tur == 'ucgen':
+            return sure * rng.triangular(p[0], p[1], p[2], (n, m))
+        olay = rng.random((n, m)) < p[0]  # gecikme
+        return sure + olay * rng.exponential(p[1], (n, m))
+
+    def _sutun_yenile(self, kid: int):
+        """Tek bağlantının sütununu güncel süre ve dağılımla yeniden örnekler."""
+        sure = np.array([self.metro.baglantilar[kid].sure], dtype=float)
+        self._ornekler[:, kid] = self._ornekle(self.dagilimlar.get(kid, self.varsayilan), sure)[:, 0]
+
+    def ornekler(self) -> np.ndarray:
+        """(ornek_sayisi × bağlantı sayısı) süre matrisi; aynı dağılımlı sütunlar birlikte örneklenir."""
+        if self._ornekler is not None:
+            return self._ornekler
+        self._rng = np.random.default_rng(self.tohum)
+        nominal = np.array([b.sure for b in self.metro.baglantilar], dtype=float)
+        gruplar: Dict[Tuple, List[int]] = defaultdict(list)
+        for b in self.metro.baglantilar:
+            gruplar[self.dagilimlar.get(b.kid, self.varsayilan)].append(b.kid)
+        S = np.empty((self.ornek_sayisi, len(nominal)))
+        for dagilim, kidler in gruplar.items():
+            S[:, kidler] = self._ornekle(dagilim, nominal[kidler])
+        self._ornekler = S
+        return S
+
+    def rota_sureleri(self, rota: List[Istasyon]) -> np.ndarray:
+        """Rotanın her senaryodaki toplam süresi (uzunluk: ornek_sayisi)."""
+        kidler = list(self.metro.rota_baglantilari(rota))
+        return self.ornekler()[:, kidler].sum(axis=1)
+
+    def _aday_sureleri(self, rotalar: List[List[Istasyon]]) -> np.ndarray:
+        """Tüm adayların süreleri tek matris çarpımıyla: (ornek_sayisi × aday sayısı)."""
+        S = self.ornekler()
+        kullanim = np.zeros((S.shape[1], len(rotalar)))
+        for j, rota in enumerate(rotalar):
+            for kid in self.metro.rota_baglantilari(rota):
+                kullanim[kid, j] += 1
+        return S @ kullanim
+
+    @staticmethod
+    def ozet(sureler: np.ndarray) -> Dict[str, float]:
+        """Ortalama ve p50/p90/p99 varış süreleri."""
+        sonuc = {'ortalama': float(sureler.mean())}
+        for q, deger in zip(YUZDELIKLER, np.percentile(sureler, YUZDELIKLER)):
+            sonuc[f'p{q}'] = float(deger)
+        return sonuc
+
+    def rota_ozeti(self, rota: List[Istasyon]) -> Dict[str, float]:
+        """Rotanın süre dağılımı özeti."""
+        return self.ozet(self.rota_sureleri(rota))
+
+    def adaylar(self, bas: Istasyon, hedef: Istasyon, k: int = 5) -> List[Tuple[List[Istasyon], int, Dict[str, float]]]:
+        """En hızlı k aday rotayı (ham rota, nominal süre, özet) olarak döndürür."""
+        yollar = self.metro.k_alternatif_rota(bas, hedef, k, ham=True)
+        if not yollar:
+            return []
+        T = self._aday_sureleri([yol for yol, _ in yollar])
+        return [(yol, cost, self.ozet(T[:, j])) for j, (yol, cost) in enumerate(yollar)]
+
+    def en_guvenilir_rota(self, bas: Istasyon, hedef: Istasyon, k: int = 5, yuzdelik: int = 90):
+        """
+        En hızlı k aday arasından verilen yüzdelikte (kuyruk) en kısa süreli rotayı
+        (ham rota, özet) olarak döndürür; rota yoksa None.
+        """
+        yollar = self.metro.k_alternatif_rota(bas, hedef, k, ham=True)
+        if not yollar:
+            return None
+        T = self._aday_sureleri([yol for yol, _ in yollar])
+        kuyruk = np.percentile(T, yuzdelik, axis=0)
+        j = int(np.argmin(kuyruk))
+        return yollar[j][0], self.ozet(T[:, j])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Örnek ağda Monte Carlo rota güvenilirliği")
+    parser.add_argument('bas', nargs='?', default='AŞTİ')
+    parser.add_argument('hedef', nargs='?', default='OSB')
+    parser.add_argument('--ornek', type=int, default=10000, help="senaryo sayısı")
+    parser.add_argument('-k', type=int, default=5, help="aday rota sayısı")
+    parser.add_argument('--yuzdelik', type=int, default=90)
+    parser.add_argument('--tohum', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    metro = ornek_ag()
+    model = GuvenilirlikModeli(metro, args.ornek, tohum=args.tohum)
+    # Örnek: Ulus–Demetevler arasında sık arıza gecikmesi, aktarmalarda geniş yürüme süresi
+    for b in metro.baglantilar:
+        if {b.i1.ad, b.i2.ad} == {'Ulus', 'Demetevler'}:
+            model.dagilim_ata(b.kid, 'gecikme', 0.2, 10.0)
+        elif b.i1.hat != b.i2.hat:
+            model.dagilim_ata(b.kid, 'ucgen', 0.8, 1.0, 2.5)
+
+    bas = metro.istasyonlar[args.bas][0]
+    hedef = metro.istasyonlar[args.hedef][0]
+    for rota, sure, ozet in model.adaylar(bas, hedef, args.k):
+        print(f"{sure:>3} dk | p50 {ozet['p50']:5.1f}  p90 {ozet['p90']:5.1f}  p99 {ozet['p99']:5.1f} | "
+              f"{' → '.join(st.ad for st in temizle_rota(rota))}")
+    sonuc = model.en_guvenilir_rota(bas, hedef, args.k, args.yuzdelik)
+    if sonuc:
+        rota, ozet = sonuc
+        print(f"En güvenilir (p{args.yuzdelik} {ozet[f'p{args.yuzdelik}']:.1f} dk):", metro.format_rota(temizle_rota(rota)))
@@ -0,0 +1,382 @@
+# metro_karsilastirma.py
+# Sürümler arası doğruluk ve performans karşılaştırması.
+# Depodaki her MetroAgi sürümü (v1–v6 ve final) dosya yolundan yüklenir, ortak bir
+# arayüze uyarlanır ve aynı rastgele ağlar ile sorgu kümeleri üzerinde çalıştırılır.
+# En hızlı rota süreleri referans Dijkstra ile, en az aktarmalı rotalar referans BFS
+# adım sayısıyla karşılaştırılır; kurulum/sorgu gecikmesi ve tracemalloc bellek tepe değeri
+# tablolanır. Sürümlerin loglama ve print çıktıları bastırılır. Aday sürüm doğru olmalı, iki
+# sorgu türünde de temelden hızlı çalışmalı ve bellek tepe değeri temelin --bellek-orani
+# katını aşmamalıdır.
+# --guncelleme ile final sürümün artımlı yapıları (rota önbelleği, hat indeksi, aktarma
+# desenleri) rastgele kapatma/açma/süre güncellemeleri altında referans Dijkstra'ya karşı denenir.
+#
+#   python metro_karsilastirma.py --istasyon 300 --sorgu 500 --aday final --temel v6
+#   python metro_karsilastirma.py --guncelleme 200 --ag 6
+
+# Gerekli kütüphaneleri içe aktar
+import argparse
+import contextlib
+import heapq
+import importlib.util
+import io
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+KLASOR = os.path.dirname(os.path.abspath(__file__))
+
+# (ad, dosya, API): 'id' sürümleri istasyon ID'si, 'nesne' sürümleri Istasyon nesnesi alır
+SURUMLER = [
+    ('v1', 'ArzuBesiroglu_MetroSimulation_v1..py', 'id'),
+    ('v2', 'ArzuBesiroglu_MetroSimulation_v2.py', 'id'),
+    ('v3', 'ArzuBesiroglu_MetroSimulation_v3.py', 'id'),
+    ('v4', 'ArzuBesiroglu_MetroSimulation_v4.py', 'id'),
+    ('v5', 'ArzuBesiroglu_MetroSimulation_v5.py', 'nesne'),
+    ('v6', 'ArzuBesiroglu_MetroSimulation_v6.py', 'nesne'),
+    ('final', 'ArzuBesiroglu_MetroSimulation.py', 'nesne'),
+]
+
+@contextlib.contextmanager
+def _sessiz():
+    """Sürümlerin stdout ve log çıktılarını geçici olarak bastırır."""
+    onceki = logging.root.manager.disable
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(onceki)
+
+def surum_yukle(ad: str, dosya: str):
+    """
+    Sürüm dosyasını ayrı bir modül olarak yükler; (modül, not) döndürür.
+    Modül düzeyindeki test kodu hata verse bile o ana kadar tanımlanan sınıflar kullanılır.
+    """
+    spec = importlib.util.spec_from_file_location(f"metro_surum_{ad}", os.path.join(KLASOR, dosya))
+    modul = importlib.util.module_from_spec(spec)
+    not_ = ''
+    with _sessiz():
+        try:
+            spec.loader.exec_module(modul)
+        except Exception as e:
+            not_ = f"içe aktarmada {type(e).__name__}"
+    if not hasattr(modul, 'MetroAgi'):
+        raise ImportError(f"{dosya}: MetroAgi bulunamadı")
+    return modul, not_
+
+class SurumAdaptoru:
+    """Bir sürümün MetroAgi sınıfını ID tabanlı ortak arayüze uyarlar."""
+    def __init__(self, ad: str, modul, api: str):
+        self.ad = ad
+        self.modul = modul
+        self.api = api
+        self.metro = None
+        self._nesne: Dict[str, object] = {}
+
+    def kur(self, istasyonlar: List[Tuple[str, str, str]], baglantilar: List[Tuple[str, str, int]]):
+        """Ağı sürümün kendi istasyon_ekle/baglanti_ekle çağrılarıyla kurar."""
+        self.metro = self.modul.MetroAgi()
+        for idx, ad, hat in istasyonlar:
+            self.metro.istasyon_ekle(idx, ad, hat)
+        for a, b, sure in baglantilar:
+            self.metro.baglanti_ekle(a, b, sure)
+        if self.api == 'nesne':
+            if hasattr(self.metro, 'istasyon_bul'):
+                self._nesne = {idx: self.metro.istasyon_bul(idx) for idx, _, _ in istasyonlar}
+            else:
+                self._nesne = {ist.idx: ist for liste in self.metro.istasyonlar.values() for ist in liste}
+
+    def _arg(self, idx):
+        return self._nesne[idx] if self.api == 'nesne' else idx
+
+    def en_hizli(self, a: str, b: str):
+        return self.metro.en_hizli_rota_bul(self._arg(a), self._arg(b))
+
+    def en_az_aktarma(self, a: str, b: str):
+        return self.metro.en_az_aktarma_bul(self._arg(a), self._arg(b))
+
+def rastgele_ag(istasyon_sayisi: int, hat_sayisi: int, ek_aktarma: int, tohum: int):
+    """
+    Doğrusal hatlardan oluşan bağlı rastgele ağ üretir: her hat önceki bir hatta aktarmayla
+    bağlanır, ayrıca ek_aktarma kadar rastgele aktarma eklenir. Çift ve döngü bağlantı yoktur.
+    """
+    rng = random.Random(tohum)
+    istasyonlar, baglantilar = [], []
+    hatlar: List[List[str]] = [[] for _ in range(hat_sayisi)]
+    for i in range(istasyon_sayisi):
+        h = i % hat_sayisi
+        idx = f"S{i}"
+        istasyonlar.append((idx, f"Durak {i}", f"Hat {h}"))
+        hatlar[h].append(idx)
+    ciftler = set()
+
+    def ekle(a, b, sure):
+        if a != b and frozenset((a, b)) not in ciftler:
+            ciftler.add(frozenset((a, b)))
+            baglantilar.append((a, b, sure))
+
+    for duraklar in hatlar:
+        for a, b in zip(duraklar, duraklar[1:]):
+            ekle(a, b, rng.randint(1, 8))
+    for h in range(1, hat_sayisi):
+        if hatlar[h]:
+            ekle(rng.choice(hatlar[h]), rng.choice(hatlar[rng.randrange(h)]), rng.randint(1, 4))
+    for _ in range(ek_aktarma):
+        h1, h2 = rng.sample(range(hat_sayisi), 2)
+        if hatlar[h1] and hatlar[h2]:
+            ekle(rng.choice(hatlar[h1]), rng.choice(hatlar[h2]), rng.randint(1, 4))
+    return istasyonlar, baglantilar
+
+def referans(baglantilar: List[Tuple[str, str, int]], kaynak: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Kaynaktan tüm istasyonlara (Dijkstra süresi, BFS adım sayısı)."""
+    komsular: Dict[str, List[Tuple[str, int]]] = {}
+    for a, b, sure in baglantilar:
+        komsular.setdefault(a, []).append((b, sure))
+        komsular.setdefault(b, []).append((a, sure))
+    mesafe = {kaynak: 0}
+    pq = [(0, kaynak)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > mesafe[u]:
+            continue
+        for v, t in komsular.get(u, ()):
+            if d + t < mesafe.get(v, float('inf')):
+                mesafe[v] = d + t
+                heapq.heappush(pq, (d + t, v))
+    adim = {kaynak: 0}
+    kuyruk = deque([kaynak])
+    while kuyruk:
+        u = kuyruk.popleft()
+        for v, _ in komsular.get(u, ()):
+            if v not in adim:
+                adim[v] = adim[u] + 1
+                kuyruk.append(v)
+    return mesafe, adim
+
+def _rota_suresi(rota, sureler: Dict[frozenset, int]) -> Optional[int]:
+    """Rota geçerli bir yürüyüşse toplam süresi, değilse None."""
+    toplam = 0
+    for a, b in zip(rota, rota[1:]):
+        t = sureler.get(frozenset((a.idx, b.idx)))
+        if t is None:
+            return None
+        toplam += t
+    return toplam
+
+class SurumSonucu:
+    """Bir sürümün tek karşılaştırmadaki ölçümleri."""
+    def __init__(self, ad: str, not_: str = ''):
+        self.ad = ad
+        self.not_ = not_
+        self.kurulum_ms = 0.0
+        self.hizli_us: List[float] = []
+        self.aktarma_us: List[float] = []
+        self.hizli_dogru = self.hizli_yanlis = self.hizli_hata = 0
+        self.aktarma_dogru = self.aktarma_yanlis = self.aktarma_hata = 0
+        self.bellek_kb = 0.0
+
+    @property
+    def dogru(self) -> bool:
+        return self.hizli_yanlis == self.hizli_hata == self.aktarma_yanlis == self.aktarma_hata == 0
+
+    @staticmethod
+    def _ort(degerler: List[float]) -> float:
+        return sum(degerler) / len(degerler) if degerler else float('nan')
+
+    @property
+    def hizli_ort_us(self) -> float:
+        return self._ort(self.hizli_us)
+
+    @property
+    def aktarma_ort_us(self) -> float:
+        return self._ort(self.aktarma_us)
+
+def _sorgular_calistir(adaptor: SurumAdaptoru, sorgular, beklenen, sureler, sonuc: Optional[SurumSonucu]):
+    """Sorguları çalıştırır; sonuc verilirse gecikme ve doğruluğu kaydeder."""
+    for a, b in sorgular:
+        mesafe, adim = beklenen[a]
+        t0 = time.perf_counter()
+        try:
+            hiz = adaptor.en_hizli(a, b)
+            hata = None
+        except Exception as e:
+            hiz, hata = None, e
+        t1 = time.perf_counter()
+        if sonuc is not None:
+            sonuc.hizli_us.append((t1 - t0) * 1e6)
+            if hata is not None:
+                sonuc.hizli_hata += 1
+            elif (hiz is None and b not in mesafe) or (
+                    hiz is not None and hiz[1] == mesafe.get(b) and _rota_suresi(hiz[0], sureler) == hiz[1]
+                    and hiz[0][0].idx == a and hiz[0][-1].idx == b):
+                sonuc.hizli_dogru += 1
+            else:
+                sonuc.hizli_yanlis += 1
+        t0 = time.perf_counter()
+        try:
+            rota = adaptor.en_az_aktarma(a, b)
+            hata = None
+        except Exception as e:
+            rota, hata = None, e
+        t1 = time.perf_counter()
+        if sonuc is not None:
+            sonuc.aktarma_us.append((t1 - t0) * 1e6)
+            if hata is not None:
+                sonuc.aktarma_hata += 1
+            elif (rota is None and b not in adim) or (
+                    rota is not None and len(rota) - 1 == adim.get(b) and _rota_suresi(rota, sureler) is not None):
+                sonuc.aktarma_dogru += 1
+            else:
+                sonuc.aktarma_yanlis += 1
+
+def karsilastir(istasyon_sayisi=300, hat_sayisi=8, ek_aktarma=20, sorgu_sayisi=500, ag_sayisi=3,
+                tohum=0, surumler=None) -> List[SurumSonucu]:
+    """
+    Her sürümü aynı ağlar ve sorgularla çalıştırır; ağlar arası toplanmış sonuçları döndürür.
+    Zamanlama ve bellek ölçümü ayrı turlarda yapılır (tracemalloc zamanlamayı bozmasın diye).
+    """
+    secili = [s for s in SURUMLER if surumler is None or s[0] in surumler]
+    yuklu = []
+    for ad, dosya, api in secili:
+        modul, not_ = surum_yukle(ad, dosya)
+        yuklu.append((SurumAdaptoru(ad, modul, api), SurumSonucu(ad, not_)))
+    with _sessiz():
+        for n in range(ag_sayisi):
+            istasyonlar, baglantilar = rastgele_ag(istasyon_sayisi, hat_sayisi, ek_aktarma, tohum + n)
+            rng = random.Random(tohum + n)
+            idler = [idx for idx, _, _ in istasyonlar]
+            sorgular = [tuple(rng.sample(idler, 2)) for _ in range(sorgu_sayisi)]
+            beklenen = {a: referans(baglantilar, a) for a in {a for a, _ in sorgular}}
+            sureler = {frozenset((a, b)): t for a, b, t in baglantilar}
+            for adaptor, sonuc in yuklu:
+                t0 = time.perf_counter()
+                adaptor.kur(istasyonlar, baglantilar)
+                sonuc.kurulum_ms += (time.perf_counter() - t0) * 1e3 / ag_sayisi
+                _sorgular_calistir(adaptor, sorgular, beklenen, sureler, sonuc)
+                # Bellek turu: temiz kurulum + aynı sorgular
+                adaptor.metro = None
+                tracemalloc.start()
+                adaptor.kur(istasyonlar, baglantilar)
+                _sorgular_calistir(adaptor, sorgular, beklenen, sureler, None)
+                sonuc.bellek_kb = max(sonuc.bellek_kb, tracemalloc.get_traced_memory()[1] / 1024)
+                tracemalloc.stop()
+                adaptor.metro = None
+    return [sonuc for _, sonuc in yuklu]
+
+def tablo(sonuclar: List[SurumSonucu]) -> str:
+    """Sonuçları metin tablosu olarak biçimlendirir."""
+    satirlar = [f"{'sürüm':<6} {'kurulum ms':>10} {'hızlı µs':>9} {'aktarma µs':>10} {'bellek KB':>9}  "
+                f"{'hızlı d/y/h':>12} {'aktarma d/y/h':>14}  not"]
+    for s in sonuclar:
+        satirlar.append(
+            f"{s.ad:<6} {s.kurulum_ms:>10.2f} {s.hizli_ort_us:>9.1f} {s.aktarma_ort_us:>10.1f} {s.bellek_kb:>9.0f}  "
+            f"{f'{s.hizli_dogru}/{s.hizli_yanlis}/{s.hizli_hata}':>12} "
+            f"{f'{s.aktarma_dogru}/{s.aktarma_yanlis}/{s.aktarma_hata}':>14}  {s.not_}")
+    return '\n'.join(satirlar)
+
+def guncelleme_regresyonu(istasyon_sayisi=120, hat_sayisi=5, ek_aktarma=10, adim_sayisi=200,
+                          adim_basina_sorgu=4, ag_sayisi=6, tohum=0) -> Dict[str, List[int]]:
+    """
+    Final sürümde rastgele baglanti_kapat/baglanti_ac/sure_guncelle adımları uygular ve her
+    adımdan sonra en_hizli_rota_bul, hat_seviyesi_rota_bul ve AktarmaDesenleri.rota_bul
+    sonuçlarını açık bağlantılar üzerinden sıfırdan koşulan Dijkstra ile karşılaştırır.
+    Ağların yarısına koordinat verilir (A* yolu da denensin). Yöntem başına [doğru, yanlış] döndürür.
+    """
+    from ArzuBesiroglu_MetroSimulation import MetroAgi
+    from metro_desen import AktarmaDesenleri
+
+    sayac: Dict[str, List[int]] = {'en_hizli': [0, 0], 'hat_seviyesi': [0, 0], 'desen': [0, 0]}
+    with _sessiz():
+        for n in range(ag_sayisi):
+            istasyonlar, baglantilar = rastgele_ag(istasyon_sayisi, hat_sayisi, ek_aktarma, tohum + n)
+            rng = random.Random(tohum + n)
+            metro = MetroAgi()
+            for idx, ad, hat in istasyonlar:
+                konum = (39.8 + rng.random() * 0.2, 32.7 + rng.random() * 0.2) if n % 2 else (None, None)
+                metro.istasyon_ekle(idx, ad, hat, *konum)
+            for a, b, sure in baglantilar:
+                metro.baglanti_ekle(a, b, sure)
+            desenler = AktarmaDesenleri(metro)
+            desenler.hesapla()
+            yontemler = (('en_hizli', metro.en_hizli_rota_bul), ('hat_seviyesi', metro.hat_seviyesi_rota_bul),
+                         ('desen', desenler.rota_bul))
+            # Küçük sabit çift havuzu: önbellekteki rotalar güncellemelerden sonra yeniden sorulsun
+            idler = [idx for idx, _, _ in istasyonlar]
+            ciftler = [rng.sample(idler, 2) for _ in range(25)]
+            for _ in range(adim_sayisi):
+                secilen = rng.choice(metro.baglantilar)
+                if rng.random() >= 0.3:
+                    metro.sure_guncelle(secilen.kid, rng.randint(1, 12))
+                elif secilen.acik:
+                    metro.baglanti_kapat(secilen.kid)
+                else:
+                    metro.baglanti_ac(secilen.kid)
+                acik = [(b.i1.idx, b.i2.idx, b.sure) for b in metro.baglantilar if b.acik]
+                sureler = {frozenset((a, b)): t for a, b, t in acik}
+                for _ in range(adim_basina_sorgu):
+                    a, h = rng.choice(ciftler)
+                    mesafe = referans(acik, a)[0]
+                    bas, hedef = metro.istasyon_bul(a), metro.istasyon_bul(h)
+                    for ad, yontem in yontemler:
+                        sonuc = yontem(bas, hedef)
+                        if sonuc is None:
+                            dogru = h not in mesafe
+                        else:
+                            rota, sure = sonuc
+                            dogru = (sure == mesafe.get(h) and _rota_suresi(rota, sureler) == sure
+                                     and rota[0] is bas and rota[-1] is hedef)
+                        sayac[ad][0 if dogru else 1] += 1
+    return sayac
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="MetroAgi sürümlerinin doğruluk ve performans karşılaştırması")
+    parser.add_argument('--istasyon', type=int, default=300)
+    parser.add_argument('--hat', type=int, default=8)
+    parser.add_argument('--ek-aktarma', type=int, default=20)
+    parser.add_argument('--sorgu', type=int, default=500, help="ağ başına sorgu sayısı")
+    parser.add_argument('--ag', type=int, default=3, help="rastgele ağ sayısı")
+    parser.add_argument('--tohum', type=int, default=0)
+    parser.add_argument('--surum', action='append', help="yalnızca bu sürüm(ler)i çalıştır")
+    parser.add_argument('--aday', default='final', help="doğru ve temelden hızlı olması gereken sürüm")
+    parser.add_argument('--temel', default='v6', help="adayın geçmesi gereken sürüm")
+    parser.add_argument('--bellek-orani', type=float, default=2.5, metavar='ORAN',
+                        help="adayın bellek tepe değeri için temelin en fazla ORAN katı "
+                             "(final rota önbelleği, birleşim kümesi ve hat indeksi tutar)")
+    parser.add_argument('--guncelleme', type=int, default=0, metavar='ADIM',
+                        help="sürüm karşılaştırması yerine ağ başına ADIM rastgele güncellemeli regresyon denetimi")
+    args = parser.parse_args()
+
+    if args.guncelleme:
+        sayac = guncelleme_regresyonu(ag_sayisi=args.ag, adim_sayisi=args.guncelleme, tohum=args.tohum)
+        for ad, (dogru, yanlis) in sayac.items():
+            print(f"{ad:<13} doğru {dogru:>6}  yanlış {yanlis:>4}")
+        gecti = not any(yanlis for _, yanlis in sayac.values())
+        print(f"\nGüncelleme regresyonu: {'GEÇTİ' if gecti else 'KALDI'}")
+        sys.exit(0 if gecti else 1)
+
+    sonuclar = karsilastir(args.istasyon, args.hat, args.ek_aktarma, args.sorgu, args.ag, args.tohum, args.surum)
+    print(tablo(sonuclar))
+    print("d/y/h: doğru / yanlış / hata (istisna)")
+    adlar = {s.ad: s for s in sonuclar}
+    aday, temel = adlar.get(args.aday), adlar.get(args.temel)
+    if aday is not None:
+        nedenler = [] if aday.dogru else ["yanlış sonuç veya hata"]
+        if temel is not None:
+            if aday.hizli_ort_us >= temel.hizli_ort_us:
+                nedenler.append(f"en hızlı sorgu {args.temel} sürümünden hızlı değil")
+            if aday.aktarma_ort_us >= temel.aktarma_ort_us:
+                nedenler.append(f"en az aktarma sorgusu {args.temel} sürümünden hızlı değil")
+            if aday.bellek_kb > temel.bellek_kb * args.bellek_orani:
+                nedenler.append(f"bellek {aday.bellek_kb:.0f} KB > {args.bellek_orani:g} x {temel.bellek_kb:.0f} KB")
+        print(f"\n{args.aday}: {'KALDI' if nedenler else 'GEÇTİ'}"
+              + (f" (hızlı sorgu {temel.hizli_ort_us / aday.hizli_ort_us:.2f}x, "
+                 f"en az aktarma {temel.aktarma_ort_us / aday.aktarma_ort_us:.2f}x, "
+                 f"bellek {aday.bellek_kb / temel.bellek_kb:.2f}x {args.temel})" if temel else ''))
+        for neden in nedenler:
+            print(f"  - {neden}")
+        sys.exit(1 if nedenler else 0)
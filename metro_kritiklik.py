@@ -0,0 +1,125 @@
+# metro_kritiklik.py
+# Ağ dayanıklılık analizi: her bağlantı kesildiğinde ortalama seyahat süresi ne kadar artar?
+# Tek kaynaklı en kısa yol ağaçlarından bağlantı/istasyon arasındalığı (betweenness) hesaplanır,
+# kesinti etkisi yalnızca ağacında o bağlantı bulunan kaynaklar için yeniden değerlendirilir.
+
+# Gerekli kütüphaneleri içe aktar
+import argparse
+import csv
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from ArzuBesiroglu_MetroSimulation import KompaktAg, MetroAgi, ornek_ag
+
+# İşçi süreçlerde paylaşılan ağ (initializer ile bir kez kurulur)
+_ISCI_AGI = None
+
+def _isci_baslat(ag: KompaktAg):
+    """İşçi sürecine kompakt ağı yükler."""
+    global _ISCI_AGI
+    _ISCI_AGI = ag
+
+def _kesinti_etkisi(gorev: Tuple[int, List[Tuple[int, float, int]]]) -> Tuple[int, float, int, int]:
+    """
+    Bir bağlantı kesildiğinde etkilenen kaynakları yeniden hesaplar.
+    gorev: (bağlantı ID, [(kaynak, eski mesafe toplamı, eski ulaşılan sayısı), ...])
+    Döndürür: (bağlantı ID, mesafe toplamı farkı, ulaşılan çift farkı, etkilenen kaynak sayısı)
+    """
+    kid, kaynaklar = gorev
+    toplam_fark = 0.0
+    cift_fark = 0
+    for s, eski_toplam, eski_sayi in kaynaklar:
+        mesafe, _, _, sira = _ISCI_AGI.agac(s, yasak=kid)
+        toplam_fark += sum(mesafe[v] for v in sira) - eski_toplam
+        cift_fark += (len(sira) - 1) - eski_sayi
+    return kid, toplam_fark, cift_fark, len(kaynaklar)
+
+def kritiklik_analizi(metro: MetroAgi, isci: int = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Her açık bağlantı ve istasyon için kritiklik ölçülerini hesaplar.
+    Döndürür: (bağlantı satırları, istasyon satırları), etkiye göre sıralı.
+    """
+    ag = metro.kompakt()
+    n = len(ag.idler)
+    kenar_arasi: Dict[int, int] = {kid: 0 for kid, _, _, _ in ag.kenarlar}
+    dugum_arasi = [0] * n
+    etkilenen: Dict[int, List[Tuple[int, float, int]]] = {kid: [] for kid in kenar_arasi}
+    taban_toplam = 0.0
+    taban_cift = 0
+
+    # 1) Her kaynaktan bir ağaç: taban ortalama süre ve arasındalık
+    for s in range(n):
+        mesafe, onceki, onceki_kenar, sira = ag.agac(s)
+        toplam = sum(mesafe[v] for v in sira)
+        taban_toplam += toplam
+        taban_cift += len(sira) - 1
+        alt = [1] * n  # alt ağaç büyüklüğü
+        for v in reversed(sira[1:]):
+            alt[onceki[v]] += alt[v]
+            kenar_arasi[onceki_kenar[v]] += alt[v]
+            dugum_arasi[v] += alt[v] - 1
+        for kid in {onceki_kenar[v] for v in sira[1:]}:
+            etkilenen[kid].append((s, toplam, len(sira) - 1))
+
+    taban_ort = taban_toplam / taban_cift if taban_cift else 0.0
+
+    # 2) Yalnızca etkilenen kaynaklar için kesinti etkisi (süreç havuzunda)
+    gorevler = [(kid, kaynaklar) for kid, kaynaklar in etkilenen.items() if kaynaklar]
+    if isci == 1:
+        _isci_baslat(ag)
+        sonuclar = list(map(_kesinti_etkisi, gorevler))
+    else:
+        with ProcessPoolExecutor(max_workers=isci, initializer=_isci_baslat, initargs=(ag,)) as havuz:
+            parca = max(1, len(gorevler) // (4 * (isci or os.cpu_count() or 1)))
+            sonuclar = list(havuz.map(_kesinti_etkisi, gorevler, chunksize=parca))
+    etki = {kid: (fark, cift, sayi) for kid, fark, cift, sayi in sonuclar}
+
+    kenar_satirlari = []
+    for kid, u, v, sure in ag.kenarlar:
+        fark, cift_fark, sayi = etki.get(kid, (0.0, 0, 0))
+        cift = taban_cift + cift_fark
+        yeni_ort = (taban_toplam + fark) / cift if cift else 0.0
+        kenar_satirlari.append({
+            'baglanti': kid, 'istasyon1': ag.idler[u], 'istasyon2': ag.idler[v], 'sure': sure,
+            'arasindalik': kenar_arasi[kid], 'etkilenen_kaynak': sayi,
+            'ort_sure_artisi': round(yeni_ort - taban_ort, 4), 'kopan_cift': -cift_fark,
+        })
+    kenar_satirlari.sort(key=lambda r: (-r['kopan_cift'], -r['ort_sure_artisi'], -r['arasindalik']))
+
+    # İstasyon kritikliği: düğüm arasındalığı + bağlı bağlantıların en kötü kesinti etkisi
+    en_kotu: Dict[str, Tuple[int, float]] = {}
+    for r in kenar_satirlari:
+        for idx in (r['istasyon1'], r['istasyon2']):
+            en_kotu[idx] = max(en_kotu.get(idx, (0, 0.0)), (r['kopan_cift'], r['ort_sure_artisi']))
+    istasyon_satirlari = []
+    for i, idx in enumerate(ag.idler):
+        kopan, artis = en_kotu.get(idx, (0, 0.0))
+        istasyon_satirlari.append({
+            'istasyon': idx, 'ad': metro.istasyon_bul(idx).ad, 'arasindalik': dugum_arasi[i],
+            'en_kotu_kopan_cift': kopan, 'en_kotu_ort_sure_artisi': artis,
+        })
+    istasyon_satirlari.sort(key=lambda r: (-r['en_kotu_kopan_cift'], -r['en_kotu_ort_sure_artisi'], -r['arasindalik']))
+    return kenar_satirlari, istasyon_satirlari
+
+def csv_yaz(satirlar: List[Dict], yol: str):
+    """Sıralı satırları sıra numarasıyla CSV dosyasına yazar."""
+    with open(yol, 'w', newline='', encoding='utf-8') as f:
+        yazici = csv.DictWriter(f, fieldnames=['sira'] + list(satirlar[0]) if satirlar else ['sira'])
+        yazici.writeheader()
+        for i, satir in enumerate(satirlar, 1):
+            yazici.writerow({'sira': i, **satir})
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Metro ağı bağlantı/istasyon kritiklik analizi")
+    parser.add_argument('-o', '--cikti', default='kritiklik_baglanti.csv', help="bağlantı sıralaması CSV dosyası")
+    parser.add_argument('--istasyon-cikti', default='kritiklik_istasyon.csv', help="istasyon sıralaması CSV dosyası")
+    parser.add_argument('--isci', type=int, default=None, help="süreç sayısı (1 = seri)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    kenarlar, istasyonlar = kritiklik_analizi(ornek_ag(), args.isci)
+    csv_yaz(kenarlar, args.cikti)
+    csv_yaz(istasyonlar, args.istasyon_cikti)
+    print(f"{len(kenarlar)} bağlantı → {args.cikti}, {len(istasyonlar)} istasyon → {args.istasyon_cikti}")
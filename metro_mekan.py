@@ -0,0 +1,120 @@
+# metro_mekan.py
+# İstasyon koordinatları için mekânsal dizin.
+# Enlem/boylam düzlemi yaklaşık eşit kenarlı (km) hücrelere bölünür; en yakın k istasyon
+# ve yarıçap sorguları yalnızca sorgu noktasının çevresindeki hücre halkalarını tarar;
+# ağdan uzak sorgularda halkalar sınır kutusundan başlar ya da istasyonlar doğrudan taranır.
+
+# Gerekli kütüphaneleri içe aktar
+import heapq
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+DUNYA_YARICAPI_KM = 6371.0088
+
+def haversine_km(enlem1: float, boylam1: float, enlem2: float, boylam2: float) -> float:
+    """İki nokta arasındaki büyük daire mesafesi (km)."""
+    f1, f2 = math.radians(enlem1), math.radians(enlem2)
+    df = f2 - f1
+    dl = math.radians(boylam2 - boylam1)
+    a = math.sin(df / 2) ** 2 + math.cos(f1) * math.cos(f2) * math.sin(dl / 2) ** 2
+    return 2 * DUNYA_YARICAPI_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class MekanDizini:
+    """
+    Koordinatlı istasyonlar için ızgara dizini.
+    Hücre boyu enlemde sabit, boylamda dizinin ortalama enlemine göre ölçeklenir;
+    halka halka genişleyen aramada r. halka sorgu noktasına en az (r - 1) * _halka_km uzaklıktadır.
+    """
+    def __init__(self, istasyonlar: Iterable, hucre_km: float = 1.0):
+        self.istasyonlar = [ist for ist in istasyonlar if ist.enlem is not None and ist.boylam is not None]
+        self.hucre_km = hucre_km
+        orta_enlem = (sum(ist.enlem for ist in self.istasyonlar) / len(self.istasyonlar)
+                      if self.istasyonlar else 0.0)
+        self._km_derece = math.pi * DUNYA_YARICAPI_KM / 180
+        self._enlem_adim = hucre_km / self._km_derece
+        self._boylam_adim = hucre_km / (self._km_derece * max(math.cos(math.radians(orta_enlem)), 1e-6))
+        self._en_buyuk_enlem = max((abs(ist.enlem) for ist in self.istasyonlar), default=0.0)
+        self._hucreler: Dict[Tuple[int, int], List] = defaultdict(list)
+        for ist in self.istasyonlar:
+            self._hucreler[self._hucre(ist.enlem, ist.boylam)].append(ist)
+        if self._hucreler:
+            satirlar = [h[0] for h in self._hucreler]
+            sutunlar = [h[1] for h in self._hucreler]
+            self._sinir = (min(satirlar), max(satirlar), min(sutunlar), max(sutunlar))
+
+    def _hucre(self, enlem: float, boylam: float) -> Tuple[int, int]:
+        return int(math.floor(enlem / self._enlem_adim)), int(math.floor(boylam / self._boylam_adim))
+
+    def _halka_km(self, enlem: float) -> float:
+        """
+        Bir halkanın sorgu noktasına uzaklığı için alt sınır (km/halka): boylam yönünde
+        hücreler kutba yaklaştıkça daralır, büyük daire kısalması için de pay bırakılır.
+        """
+        cos = math.cos(math.radians(min(90.0, max(self._en_buyuk_enlem, abs(enlem)))))
+        return 0.999 * max(min(self.hucre_km, self._boylam_adim * self._km_derece * cos), 1e-6)
+
+    def _halka(self, merkez: Tuple[int, int], r: int):
+        """Merkez hücreye Chebyshev uzaklığı tam r olan dolu hücrelerdeki istasyonlar (sınır kutusuna kırpılır)."""
+        i0, j0 = merkez
+        s0, s1, t0, t1 = self._sinir
+        for i in range(max(i0 - r, s0), min(i0 + r, s1) + 1):
+            if abs(i - i0) == r:
+                sutunlar = range(max(j0 - r, t0), min(j0 + r, t1) + 1)
+            else:
+                sutunlar = [j for j in {j0 - r, j0 + r} if t0 <= j <= t1]
+            for j in sutunlar:
+                yield from self._hucreler.get((i, j), ())
+
+    def _halka_araligi(self, merkez: Tuple[int, int]) -> Tuple[int, int]:
+        """Dolu hücre içerebilen ilk ve son halka: sınır kutusuna ve en uzak köşesine Chebyshev uzaklığı."""
+        s0, s1, t0, t1 = self._sinir
+        ilk = max(s0 - merkez[0], merkez[0] - s1, t0 - merkez[1], merkez[1] - t1, 0)
+        son = max(abs(merkez[0] - s0), abs(merkez[0] - s1), abs(merkez[1] - t0), abs(merkez[1] - t1))
+        return ilk, son
+
+    def en_yakin(self, enlem: float, boylam: float, k: int = 1) -> List[Tuple[object, float]]:
+        """Noktaya en yakın k istasyonu (istasyon, km) olarak yakından uzağa döndürür."""
+        if not self.istasyonlar or k <= 0:
+            return []
+        merkez = self._hucre(enlem, boylam)
+        ilk, son = self._halka_araligi(merkez)
+        if son - ilk + 1 > len(self._hucreler):
+            # Ağdan uzak sorgu: halka taramak dolu hücre sayısından pahalı, doğrudan tara
+            mesafeler = ((haversine_km(enlem, boylam, ist.enlem, ist.boylam), i, ist)
+                         for i, ist in enumerate(self.istasyonlar))
+            return [(ist, d) for d, _, ist in heapq.nsmallest(k, mesafeler)]
+        adaylar = []  # (-mesafe, sayaç, istasyon) en büyük yığını
+        sayac = 0
+        halka_km = self._halka_km(enlem)
+        for r in range(ilk, son + 1):
+            # Bu halka ve sonrakiler en az (r - 1) hücre uzakta: k aday bundan yakınsa dur
+            if len(adaylar) == k and -adaylar[0][0] <= (r - 1) * halka_km:
+                break
+            for ist in self._halka(merkez, r):
+                d = haversine_km(enlem, boylam, ist.enlem, ist.boylam)
+                sayac += 1
+                if len(adaylar) < k:
+                    heapq.heappush(adaylar, (-d, sayac, ist))
+                elif d < -adaylar[0][0]:
+                    heapq.heapreplace(adaylar, (-d, sayac, ist))
+        return [(ist, -d) for d, _, ist in sorted(adaylar, reverse=True)]
+
+    def yaricap_icinde(self, enlem: float, boylam: float, km: float) -> List[Tuple[object, float]]:
+        """Noktaya en fazla km uzaklıktaki istasyonları yakından uzağa döndürür."""
+        if not self.istasyonlar:
+            return []
+        merkez = self._hucre(enlem, boylam)
+        ilk, son = self._halka_araligi(merkez)
+        son = min(son, int(math.ceil(km / self._halka_km(enlem))) + 1)
+        if son - ilk + 1 > len(self._hucreler):
+            adaylar = self.istasyonlar
+        else:
+            adaylar = (ist for r in range(ilk, son + 1) for ist in self._halka(merkez, r))
+        sonuc = []
+        for ist in adaylar:
+            d = haversine_km(enlem, boylam, ist.enlem, ist.boylam)
+            if d <= km:
+                sonuc.append((ist, d))
+        sonuc.sort(key=lambda r: r[1])
+        return sonuc
@@ -0,0 +1,169 @@
+# metro_profil.py
+# İsteğe bağlı profilleme: MetroAgi örneğinin yükleme ve sorgu metotlarını cProfile ile
+# sarar, tracemalloc ile bellek ayırmalarını izler. Süreç bitince şunları yazar:
+#   metro-<pid>.folded      flame graph araçlarına (flamegraph.pl, speedscope) hazır katlanmış yığınlar
+#   metro-<pid>.pstats      ham cProfile çıktısı (python -m pstats ile incelenebilir)
+#   metro-<pid>-bellek.txt  en çok bellek ayıran ilk N satır
+# Yalnızca METRO_PROFIL ortam değişkeni ya da --profil bayrağı verildiğinde yüklenir;
+# kapalıyken sınıfa hiçbir sarmalayıcı eklenmez.
+
+# Gerekli kütüphaneleri içe aktar
+import atexit
+import cProfile
+import functools
+import multiprocessing
+import os
+import pstats
+import sys
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# Sarılan MetroAgi metotları (yükleme + sorgu + biçimlendirme)
+METOTLAR = ('istasyon_ekle', 'baglanti_ekle', 'en_az_aktarma_bul', 'en_hizli_rota_bul',
+            'k_alternatif_rota', 'hat_seviyesi_rota_bul', 'sure_matrisi', 'format_rota')
+
+_SUREC_PROFILCISI: Optional['Profilci'] = None
+
+class Profilci:
+    """
+    Örnek metotlarını saran cProfile + tracemalloc oturumu.
+    İç içe çağrılar (ör. normallestir → baglanti_ekle) profili yeniden açmaz.
+    """
+    def __init__(self, klasor: str = 'profil', ilk_n: int = 20, iz_derinligi: int = 10):
+        self.klasor = klasor
+        self.ilk_n = ilk_n
+        self.iz_derinligi = iz_derinligi
+        self.profil = cProfile.Profile()
+        self.cagrilar: Dict[str, int] = defaultdict(int)
+        self._derinlik = 0
+        self._yazildi = False
+
+    def baslat(self):
+        """Bellek izlemeyi başlatır (zaten açıksa dokunmaz)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.iz_derinligi)
+
+    def sar(self, metro, metotlar=METOTLAR):
+        """Verilen metotları yalnızca bu örnek için profilleyen sarmalayıcılarla değiştirir."""
+        for ad in metotlar:
+            asil = getattr(metro, ad, None)
+            if asil is not None:
+                setattr(metro, ad, self._sarici(ad, asil))
+        return metro
+
+    def _sarici(self, ad, asil):
+        @functools.wraps(asil)
+        def sarici(*args, **kwargs):
+            self.cagrilar[ad] += 1
+            if self._derinlik:
+                return asil(*args, **kwargs)
+            self._derinlik += 1
+            self.profil.enable()
+            try:
+                return asil(*args, **kwargs)
+            finally:
+                self.profil.disable()
+                self._derinlik -= 1
+        return sarici
+
+    def yaz(self) -> List[str]:
+        """Katlanmış yığınları, pstats dökümünü ve bellek raporunu yazar; dosya yollarını döndürür."""
+        if self._yazildi:
+            return []
+        self._yazildi = True
+        # Anlık görüntü önce alınır: rapor üretiminin kendi ayırmaları karışmasın
+        anlik = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        os.makedirs(self.klasor, exist_ok=True)
+        onek = os.path.join(self.klasor, f"metro-{os.getpid()}")
+        dosyalar = []
+        try:
+            stats = pstats.Stats(self.profil)
+        except TypeError:  # hiçbir sarılı metot çağrılmadı
+            stats = None
+        if stats is not None:
+            stats.dump_stats(onek + '.pstats')
+            with open(onek + '.folded', 'w', encoding='utf-8') as f:
+                for yigin, us in sorted(katlanmis_yigitlar(stats).items()):
+                    if us >= 1:
+                        f.write(f"{yigin} {int(us)}\n")
+            dosyalar += [onek + '.folded', onek + '.pstats']
+        if anlik is not None:
+            with open(onek + '-bellek.txt', 'w', encoding='utf-8') as f:
+                f.write(bellek_raporu(anlik, self.ilk_n))
+                f.write("\nÇağrı sayıları: " + ', '.join(f"{ad}={n}" for ad, n in sorted(self.cagrilar.items())) + "\n")
+            dosyalar.append(onek + '-bellek.txt')
+        sys.stderr.write(f"Profil yazıldı: {', '.join(dosyalar)}\n")
+        return dosyalar
+
+def _etiket(fonksiyon: Tuple[str, int, str]) -> str:
+    dosya, satir, ad = fonksiyon
+    if dosya == '~':  # yerleşik fonksiyon
+        return ad
+    return f"{ad} ({os.path.basename(dosya)}:{satir})"
+
+def katlanmis_yigitlar(stats: pstats.Stats, derinlik: int = 64) -> Dict[str, float]:
+    """
+    pstats çağıran tablolarından katlanmış yığınlar (yığın -> µs) türetir.
+    Her fonksiyonun kendi süresi, çağıranlara o çağıranın kümülatif süre payıyla
+    dağıtılarak köke kadar yukarı taşınır; döngüler ve ihmal edilebilir paylar kesilir.
+    """
+    tablo = stats.stats
+    sonuc: Dict[str, float] = defaultdict(float)
+
+    def yukari(yol: List, pay: float):
+        cagiranlar = [(c, v[3]) for c, v in tablo[yol[-1]][4].items() if c in tablo and c not in yol]
+        toplam = sum(ct for _, ct in cagiranlar)
+        if not cagiranlar or toplam <= 0 or len(yol) >= derinlik or pay < 1e-7:
+            sonuc[';'.join(_etiket(f) for f in reversed(yol))] += pay * 1e6
+            return
+        for c, ct in cagiranlar:
+            yukari(yol + [c], pay * ct / toplam)
+
+    for fonksiyon, (_, _, tt, _, _) in tablo.items():
+        if tt > 0 and '_lsprof.Profiler' not in fonksiyon[2]:
+            yukari([fonksiyon], tt)
+    return sonuc
+
+def bellek_raporu(anlik: tracemalloc.Snapshot, ilk_n: int = 20) -> str:
+    """Anlık görüntüdeki en büyük ilk_n ayırma satırını ve en büyüğün yığınını döndürür."""
+    anlik = anlik.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, pstats.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ))
+    istatistikler = anlik.statistics('lineno')
+    toplam = sum(s.size for s in istatistikler)
+    satirlar = [f"Toplam izlenen bellek: {toplam / 1024:.1f} KB", f"En çok ayıran {ilk_n} satır:"]
+    for i, s in enumerate(istatistikler[:ilk_n], 1):
+        kare = s.traceback[0]
+        satirlar.append(f"{i:>3}. {s.size / 1024:9.1f} KB {s.count:>8} blok  "
+                        f"{os.path.basename(kare.filename)}:{kare.lineno}")
+    izler = anlik.statistics('traceback')
+    if izler:
+        satirlar.append("\nEn büyük ayırmanın yığını:")
+        satirlar.extend('    ' + satir for satir in izler[0].traceback.format())
+    return '\n'.join(satirlar) + '\n'
+
+def surec_profilcisi(klasor: Optional[str] = None) -> Profilci:
+    """
+    Süreç başına tek profilci döndürür; ilk çağrıda bellek izlemeyi başlatır ve
+    çıkışta yazmayı kaydeder (süreç havuzu işçilerinde multiprocessing sonlandırıcısıyla).
+    """
+    global _SUREC_PROFILCISI
+    if _SUREC_PROFILCISI is None:
+        if not klasor or klasor == '1':
+            klasor = 'profil'
+        _SUREC_PROFILCISI = Profilci(klasor)
+        _SUREC_PROFILCISI.baslat()
+        if multiprocessing.parent_process() is None:
+            atexit.register(_SUREC_PROFILCISI.yaz)
+        else:
+            # İşçi süreçler os._exit ile biter; atexit çalışmaz
+            from multiprocessing.util import Finalize
+            Finalize(None, _SUREC_PROFILCISI.yaz, exitpriority=10)
+    return _SUREC_PROFILCISI
@@ -0,0 +1,304 @@
+# metro_simulasyon.py
+# Ayrık olay tabanlı sürücüsüz tren simülasyonu.
+# Heap tabanlı olay kuyruğu üzerinde trenler her hattı sefer aralığıyla (headway) dolaşır,
+# duraklarda bekler (dwell), uç istasyonlarda geri döner (turnback); yolcular Poisson
+# süreciyle gelir, en hızlı rotalarının hat bacaklarına göre biner, aktarma yapar ve iner.
+
+# Gerekli kütüphaneleri içe aktar
+import argparse
+import heapq
+import json
+import logging
+import math
+import random
+import time
+from collections import defaultdict, deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ArzuBesiroglu_MetroSimulation import Istasyon, MetroAgi, ornek_ag
+
+# Olay türleri
+TREN_VARIS = 0
+TREN_KALKIS = 1
+YOLCU_GELIS = 2
+YOLCU_AKTARMA = 3
+SEFER_BASLAT = 4
+
+class Yolcu:
+    """Simülasyondaki tek bir yolcu ve kalan rota bacakları."""
+    def __init__(self, yid: int, gelis: float, bacaklar: List[Tuple], son_aktarma: int, ideal_sure: int):
+        self.yid = yid
+        self.gelis = gelis
+        self.bacaklar = bacaklar  # [(hat, yön, biniş istasyonu, iniş istasyonu, binişten önceki aktarma)]
+        self.bacak = 0
+        self.son_aktarma = son_aktarma  # son inişten hedef perona yürüme süresi
+        self.ideal_sure = ideal_sure
+
+class Tren:
+    """Bir hat üzerinde gidip gelen sürücüsüz tren."""
+    def __init__(self, tid: int, hat: str):
+        self.tid = tid
+        self.hat = hat
+        self.konum = 0  # hat sırasındaki durak indeksi
+        self.yon = 1    # +1: sıra yönü, -1: ters yön
+        self.yuk = 0
+        self.inecekler: Dict[Istasyon, List[Yolcu]] = defaultdict(list)
+
+class JsonSatirKaydi:
+    """Olayları dosyaya satır başına bir JSON nesnesi (NDJSON) olarak yazan kayıt hedefi."""
+    def __init__(self, dosya):
+        self.dosya = dosya
+
+    def __call__(self, olay: Dict):
+        self.dosya.write(json.dumps(olay, ensure_ascii=False) + '\n')
+
+class SimulasyonIstatistikleri:
+    """Simülasyon boyunca biriken sayaçlar."""
+    def __init__(self):
+        self.olay_sayisi = 0
+        self.gelen_yolcu = 0
+        self.tamamlanan_yolcu = 0
+        self.rotasiz_yolcu = 0
+        self.binis: Dict[str, int] = defaultdict(int)         # istasyon ID -> biniş
+        self.kalan_yolcu: Dict[str, int] = defaultdict(int)   # istasyon ID -> kapasite nedeniyle binemeyen
+        self.kesit_yuku: Dict[Tuple[str, str], int] = defaultdict(int)  # (ID, ID) -> en yüksek tren yükü
+        self.toplam_gecikme = 0.0
+        self.en_buyuk_gecikme = 0.0
+
+    def ortalama_gecikme(self) -> float:
+        """Tamamlanan yolculuklarda ideal süreye göre ortalama gecikme (dk)."""
+        return self.toplam_gecikme / self.tamamlanan_yolcu if self.tamamlanan_yolcu else 0.0
+
+class Simulasyon:
+    """
+    Metro ağı üzerinde ayrık olay simülasyonu.
+    Zaman birimi dakikadır; kayit verilirse her olay sözlük olarak ona iletilir.
+    """
+    def __init__(self, metro: MetroAgi, sefer_araligi=5.0, durus_suresi=0.5, donus_suresi=3.0,
+                 kapasite=800, yolcu_orani=60.0, sure=24 * 60, tohum=0,
+                 kayit: Optional[Callable[[Dict], None]] = None):
+        self.metro = metro
+        self.sefer_araligi = sefer_araligi
+        self.durus_suresi = durus_suresi
+        self.donus_suresi = donus_suresi
+        self.kapasite = kapasite
+        self.yolcu_orani = yolcu_orani  # istasyon (peron) başına saatlik yolcu
+        self.sure = sure
+        self.kayit = kayit
+        self.rng = random.Random(tohum)
+        self.hatlar = metro.hat_sirasi()
+        self.konum: Dict[Istasyon, int] = {}  # istasyon -> hat sırasındaki indeks
+        for duraklar, _ in self.hatlar.values():
+            for i, ist in enumerate(duraklar):
+                self.konum[ist] = i
+        self.istasyonlar = [ist for duraklar, _ in self.hatlar.values() for ist in duraklar]
+        self.peron: Dict[Tuple[Istasyon, int], deque] = defaultdict(deque)  # (istasyon, yön) -> bekleyenler
+        self.istatistik = SimulasyonIstatistikleri()
+        self._rota_bacaklari: Dict[Tuple[Istasyon, Istasyon], Optional[Tuple[List[Tuple], int, int]]] = {}
+        self._olaylar: List[Tuple] = []
+        self._sayac = 0
+        self._yolcu_sayaci = 0
+
+    def _planla(self, zaman, tur, *veri):
+        """Olay kuyruğuna yeni olay ekler."""
+        self._sayac += 1
+        heapq.heappush(self._olaylar, (zaman, self._sayac, tur, veri))
+
+    def _kaydet(self, zaman, olay, **alanlar):
+        """Olayı (varsa) kayıt hedefine iletir."""
+        if self.kayit is not None:
+            self.kayit({'t': round(zaman, 3), 'olay': olay, **alanlar})
+
+    def _bacaklar(self, bas: Istasyon, hedef: Istasyon):
+        """
+        En hızlı rotayı hat bacaklarına böler (OD çifti başına önbellekli).
+        Rotalar hedef köklü en kısa yol ağacından okunur; hedef başına tek arama yapılır.
+        Döndürür: ([(hat, yön, biniş, iniş, binişten önceki aktarma süresi)], son aktarma süresi, ideal süre)
+        """
+        key = (bas, hedef)
+        if key in self._rota_bacaklari:
+            return self._rota_bacaklari[key]
+        mesafe, sonraki = self.metro.en_kisa_yol_agaci(hedef)
+        bacaklar = None
+        if bas in mesafe:
+            rota, ideal = MetroAgi.agac_yolu(bas, sonraki), mesafe[bas]
+            bacaklar = []
+            aktarma = 0  # henüz bir bacağa yazılmamış yürüme/aktarma süresi
+            i = 0
+            while i < len(rota) - 1:
+                j = i
+                while j + 1 < len(rota) and rota[j + 1].hat == rota[i].hat:
+                    j += 1
+                if j == i:
+                    aktarma += min(t for nbr, t in rota[i].komsular if nbr is rota[i + 1])
+                    i += 1
+                    continue
+                if rota[i] not in self.konum:
+                    bacaklar = None
+                    break
+                yon = 1 if self.konum[rota[j]] > self.konum[rota[i]] else -1
+                bacaklar.append((rota[i].hat, yon, rota[i], rota[j], aktarma))
+                aktarma = 0
+                i = j
+            if bacaklar is not None:
+                bacaklar = (bacaklar, aktarma, ideal)
+        self._rota_bacaklari[key] = bacaklar
+        return bacaklar
+
+    def _filo_kur(self):
+        """Her hat için tur süresine yetecek kadar treni sefer aralığıyla yola çıkarır."""
+        tid = 0
+        for hat, (duraklar, kenarlar) in self.hatlar.items():
+            yol = sum(self.metro.baglantilar[kid].sure for kid in kenarlar)
+            tur = 2 * (yol + len(duraklar) * self.durus_suresi + self.donus_suresi)
+            filo = max(1, math.ceil(tur / self.sefer_araligi))
+            for k in range(filo):
+                self._planla(k * self.sefer_araligi, SEFER_BASLAT, Tren(tid, hat))
+                tid += 1
+
+    def _yolcu_gelisi_planla(self, zaman, ist):
+        """İstasyondaki bir sonraki yolcu gelişini üstel aralıkla planlar."""
+        if self.yolcu_orani > 0:
+            zaman += self.rng.expovariate(self.yolcu_orani / 60.0)
+            if zaman < self.sure:
+                self._planla(zaman, YOLCU_GELIS, ist)
+
+    def calistir(self) -> SimulasyonIstatistikleri:
+        """Simülasyonu süre dolana ve olay kuyruğu boşalana kadar çalıştırır."""
+        self._filo_kur()
+        for ist in self.istasyonlar:
+            self._yolcu_gelisi_planla(0.0, ist)
+        istatistik = self.istatistik
+        while self._olaylar:
+            zaman, _, tur, veri = heapq.heappop(self._olaylar)
+            istatistik.olay_sayisi += 1
+            if tur == TREN_VARIS:
+                self._tren_varis(zaman, *veri)
+            elif tur == TREN_KALKIS:
+                self._tren_kalkis(zaman, *veri)
+            elif tur == YOLCU_GELIS:
+                self._yolcu_gelis(zaman, *veri)
+            elif tur == YOLCU_AKTARMA:
+                self._peronla(zaman, *veri)
+            elif tur == SEFER_BASLAT:
+                tren = veri[0]
+                self._kaydet(zaman, 'sefer', tren=tren.tid, hat=tren.hat)
+                self._planla(zaman, TREN_VARIS, tren)
+        return istatistik
+
+    def _yolcu_gelis(self, zaman, ist):
+        """Yeni yolcu: rastgele hedef seçilir, ilk bacağın peronuna alınır."""
+        self._yolcu_gelisi_planla(zaman, ist)
+        self.istatistik.gelen_yolcu += 1
+        hedef = self.rng.choice(self.istasyonlar)
+        if hedef.ad == ist.ad:
+            return
+        bacaklar = self._bacaklar(ist, hedef)
+        if bacaklar is None:
+            self.istatistik.rotasiz_yolcu += 1
+            return
+        if not bacaklar[0]:
+            # Yalnızca yürüme aktarmasından oluşan yolculuk (ör. bağlı iki peron)
+            self.istatistik.tamamlanan_yolcu += 1
+            return
+        self._yolcu_sayaci += 1
+        yolcu = Yolcu(self._yolcu_sayaci, zaman, *bacaklar)
+        self._kaydet(zaman, 'yolcu', yolcu=yolcu.yid, bas=ist.idx, hedef=hedef.idx)
+        self._aktar(zaman, yolcu)
+
+    def _aktar(self, zaman, yolcu: Yolcu):
+        """Sıradaki bacağa geçiş: aktarma süresi varsa yürüme olayı planlanır."""
+        aktarma = yolcu.bacaklar[yolcu.bacak][4]
+        if aktarma:
+            self._planla(zaman + aktarma, YOLCU_AKTARMA, yolcu)
+        else:
+            self._peronla(zaman, yolcu)
+
+    def _peronla(self, zaman, yolcu: Yolcu):
+        """Yolcuyu mevcut bacağının biniş peronunda kuyruğa alır."""
+        _, yon, binis, _, _ = yolcu.bacaklar[yolcu.bacak]
+        self.peron[(binis, yon)].append(yolcu)
+
+    def _tren_varis(self, zaman, tren: Tren):
+        """Tren istasyona varır: inenler iner, uçta ise geri döner, bekleyenler biner."""
+        duraklar, _ = self.hatlar[tren.hat]
+        ist = duraklar[tren.konum]
+        inenler = tren.inecekler.pop(ist, ())
+        if inenler:
+            tren.yuk -= len(inenler)
+            self._kaydet(zaman, 'inis', tren=tren.tid, istasyon=ist.idx, adet=len(inenler))
+            for yolcu in inenler:
+                yolcu.bacak += 1
+                if yolcu.bacak < len(yolcu.bacaklar):
+                    self._aktar(zaman, yolcu)
+                else:
+                    gecikme = (zaman + yolcu.son_aktarma - yolcu.gelis) - yolcu.ideal_sure
+                    self.istatistik.tamamlanan_yolcu += 1
+                    self.istatistik.toplam_gecikme += gecikme
+                    self.istatistik.en_buyuk_gecikme = max(self.istatistik.en_buyuk_gecikme, gecikme)
+
+        bekleme = self.durus_suresi
+        sonraki = tren.konum + tren.yon
+        if not 0 <= sonraki < len(duraklar):
+            tren.yon = -tren.yon
+            bekleme += self.donus_suresi
+            self._kaydet(zaman, 'donus', tren=tren.tid, istasyon=ist.idx)
+
+        kuyruk = self.peron.get((ist, tren.yon))
+        if kuyruk:
+            binen = 0
+            while kuyruk and tren.yuk < self.kapasite:
+                yolcu = kuyruk.popleft()
+                tren.inecekler[yolcu.bacaklar[yolcu.bacak][3]].append(yolcu)
+                tren.yuk += 1
+                binen += 1
+            self.istatistik.binis[ist.idx] += binen
+            if kuyruk:
+                self.istatistik.kalan_yolcu[ist.idx] += len(kuyruk)
+            self._kaydet(zaman, 'binis', tren=tren.tid, istasyon=ist.idx, adet=binen, yuk=tren.yuk)
+        self._planla(zaman + bekleme, TREN_KALKIS, tren)
+
+    def _tren_kalkis(self, zaman, tren: Tren):
+        """Tren sonraki durağa hareket eder; bağlantı kapalıysa o durakta geri döner."""
+        if zaman >= self.sure and tren.yuk == 0:
+            return  # servis bitti, tren depoya çekilir
+        duraklar, kenarlar = self.hatlar[tren.hat]
+        kid = kenarlar[min(tren.konum, tren.konum + tren.yon)]
+        baglanti = self.metro.baglantilar[kid]
+        if not baglanti.acik:
+            tren.yon = -tren.yon
+            self._kaydet(zaman, 'donus', tren=tren.tid, istasyon=duraklar[tren.konum].idx, neden='kapali')
+            self._planla(zaman + self.donus_suresi, TREN_VARIS, tren)
+            return
+        a, b = duraklar[tren.konum], duraklar[tren.konum + tren.yon]
+        key = (a.idx, b.idx)
+        if tren.yuk > self.istatistik.kesit_yuku[key]:
+            self.istatistik.kesit_yuku[key] = tren.yuk
+        tren.konum += tren.yon
+        self._planla(zaman + baglanti.sure, TREN_VARIS, tren)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Örnek ağ üzerinde bir günlük sürücüsüz tren simülasyonu")
+    parser.add_argument('--sure', type=float, default=24 * 60, help="simülasyon süresi (dk)")
+    parser.add_argument('--sefer-araligi', type=float, default=5.0, help="sefer aralığı (dk)")
+    parser.add_argument('--yolcu-orani', type=float, default=60.0, help="peron başına saatlik yolcu")
+    parser.add_argument('--kapasite', type=int, default=800)
+    parser.add_argument('--tohum', type=int, default=0)
+    parser.add_argument('--log', help="olayların yazılacağı NDJSON dosyası")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    dosya = open(args.log, 'w', encoding='utf-8') if args.log else None
+    sim = Simulasyon(ornek_ag(), sefer_araligi=args.sefer_araligi, kapasite=args.kapasite,
+                     yolcu_orani=args.yolcu_orani, sure=args.sure, tohum=args.tohum,
+                     kayit=JsonSatirKaydi(dosya) if dosya else None)
+    t0 = time.perf_counter()
+    ist = sim.calistir()
+    gecen = time.perf_counter() - t0
+    if dosya:
+        dosya.close()
+    print(f"{ist.olay_sayisi} olay, {gecen:.2f} sn ({args.sure * 60 / max(gecen, 1e-9):.0f}x gerçek zaman)")
+    print(f"Gelen: {ist.gelen_yolcu}, tamamlanan: {ist.tamamlanan_yolcu}, rotasız: {ist.rotasiz_yolcu}")
+    print(f"Ortalama gecikme: {ist.ortalama_gecikme():.2f} dk, en büyük: {ist.en_buyuk_gecikme:.2f} dk")
+    for idx, adet in sorted(ist.binis.items(), key=lambda r: -r[1])[:5]:
+        print(f"  {idx}: {adet} biniş, {ist.kalan_yolcu.get(idx, 0)} kez perona kalan")
@@ -0,0 +1,195 @@
+# metro_toplu.py
+# Toplu sorgu modu: stdin'den ya da dosyadan NDJSON sorgular okur,
+# her satır için NDJSON rota sonucu yazar. Her sonuç hazır olduğunda yazılıp boşaltıldığı
+# için açık tutulan bir boru üzerinden etkileşimli de kullanılabilir; bekleyen sorgu sayısı
+# sınırlı olduğundan bellek kullanımı sorgu sayısından bağımsızdır. Renk, loglama ve animasyon kullanılmaz.
+#
+# Sorgu satırı:  {"id": 1, "bas": "AŞTİ", "hedef": "OSB", "mod": "ikisi"}
+#   bas/hedef istasyon ID'si (ör. "M1") veya adı olabilir; mod: "hizli" | "aktarma" | "ikisi"
+# Hatalı satırlar (geçersiz JSON, bilinmeyen istasyon/mod) {"id": ..., "hata": "..."} kaydı üretir.
+
+# Gerekli kütüphaneleri içe aktar
+import argparse
+import json
+import logging
+import sys
+import threading
+from queue import Empty, Queue
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from ArzuBesiroglu_MetroSimulation import Istasyon, MetroAgi, ornek_ag, temizle_rota
+
+# İşçi süreçteki ağ (initializer ile bir kez kurulur)
+_AG: Optional[MetroAgi] = None
+
+MODLAR = ('hizli', 'aktarma', 'ikisi')
+
+def _ag_kur():
+    """Ağı loglama kapalıyken kurar (işçi başlatıcısı olarak da kullanılır)."""
+    global _AG
+    logging.disable(logging.CRITICAL)
+    _AG = ornek_ag()
+
+def _istasyon(metro: MetroAgi, deger: str) -> Istasyon:
+    """ID veya ad ile istasyonu bulur; aksan farkları tolere edilir."""
+    if not isinstance(deger, str):
+        raise TypeError(f"istasyon metin olmalı: {deger!r}")
+    try:
+        return metro.istasyon_bul(deger)
+    except KeyError:
+        pass
+    if deger in metro.istasyonlar:
+        return metro.istasyonlar[deger][0]
+    adlar = metro.istasyon_dizini().tam_eslesme(deger)
+    if adlar:
+        return metro.istasyonlar[adlar[0]][0]
+    raise KeyError(f"bilinmeyen istasyon: {deger}")
+
+def _rota_json(rota, sure=None) -> Dict:
+    """Rotayı ID ve (aktarma adımları temizlenmiş) ad listesi olarak döndürür."""
+    sonuc = {'rota': [st.idx for st in rota], 'adlar': [st.ad for st in temizle_rota(rota)]}
+    if sure is not None:
+        sonuc['sure'] = sure
+    return sonuc
+
+def sorgu_isle(satir: str) -> str:
+    """Tek bir NDJSON sorgu satırını yanıtlar ve NDJSON sonuç satırı döndürür."""
+    try:
+        sorgu = json.loads(satir)
+    except ValueError as e:
+        return json.dumps({'id': None, 'hata': f"geçersiz JSON: {e}"}, ensure_ascii=False)
+    if not isinstance(sorgu, dict):
+        return json.dumps({'id': None, 'hata': "sorgu bir JSON nesnesi olmalı"}, ensure_ascii=False)
+    eksik = [alan for alan in ('bas', 'hedef') if alan not in sorgu]
+    if eksik:
+        return json.dumps({'id': sorgu.get('id'), 'hata': f"eksik alan: {', '.join(eksik)}"}, ensure_ascii=False)
+    try:
+        bas = _istasyon(_AG, sorgu['bas'])
+        hedef = _istasyon(_AG, sorgu['hedef'])
+    except (KeyError, TypeError) as e:
+        return json.dumps({'id': sorgu.get('id'), 'hata': str(e.args[0]) if e.args else str(e)}, ensure_ascii=False)
+    mod = sorgu.get('mod', 'ikisi')
+    if mod not in MODLAR:
+        return json.dumps({'id': sorgu.get('id'), 'hata': f"bilinmeyen mod: {mod!r} ({', '.join(MODLAR)})"},
+                          ensure_ascii=False)
+    sonuc = {'id': sorgu.get('id'), 'bas': bas.idx, 'hedef': hedef.idx}
+    if mod in ('hizli', 'ikisi'):
+        hiz = _AG.en_hizli_rota_bul(bas, hedef)
+        sonuc['hizli'] = _rota_json(*hiz) if hiz else None
+    if mod in ('aktarma', 'ikisi'):
+        az = _AG.en_az_aktarma_bul(bas, hedef)
+        sonuc['aktarma'] = _rota_json(az) if az else None
+    return json.dumps(sonuc, ensure_ascii=False)
+
+def _satirlar(girdi: TextIO) -> Iterator[str]:
+    """Boş olmayan satırları akış hâlinde verir."""
+    for satir in girdi:
+        if satir.strip():
+            yield satir
+
+def _parca_isle(parca: List[str]) -> List[str]:
+    """İşçi süreçte bir sorgu partisini yanıtlar."""
+    return [sorgu_isle(satir) for satir in parca]
+
+def calistir(girdi: TextIO, cikti: TextIO, isci: int = 1, pencere: int = 10000, parti: int = 256):
+    """
+    Sorguları akış hâlinde yanıtlar; her sonuç hazır olur olmaz yazılır.
+    isci > 1 ise okuyucu iş parçacığı satırları sınırlı bir kuyruğa aktarır; o an hazır
+    olan satırlar en fazla 'parti' satırlık partiler hâlinde süreç havuzuna gönderilir.
+    Gönderilen partiler sıralı bir kuyrukta bekler ve yazıcı iş parçacığı kuyruğun başı
+    tamamlandıkça sonuçları girdi sırasıyla yazar; böylece yoğun girdide parti başına
+    havuz maliyeti paylaşılır, açık tutulan bir boruda ise tek sorgu da hemen yanıtlanır.
+    Bellekte en fazla yaklaşık 2 x 'pencere' sorgu bekler.
+    """
+    satirlar = _satirlar(girdi)
+    if isci <= 1:
+        if _AG is None:
+            _ag_kur()
+        for satir in satirlar:
+            cikti.write(sorgu_isle(satir) + '\n')
+            cikti.flush()
+        return
+    # Süreç havuzu yalnızca gerektiğinde yüklenir (tek süreçli kısa çağrılarda açılış süresi)
+    from concurrent.futures import ProcessPoolExecutor
+    parti = max(1, min(parti, pencere))
+    okunan: Queue = Queue(maxsize=max(1, pencere))             # okunmuş, gönderilmemiş satırlar
+    bekleyen: Queue = Queue(maxsize=max(1, pencere // parti))  # gönderilmiş, yazılmamış partiler
+    hatalar = []
+
+    def okuyucu():
+        try:
+            for satir in satirlar:
+                okunan.put(satir)
+        except Exception as e:
+            hatalar.append(e)
+        finally:
+            okunan.put(None)
+
+    def yazici():
+        while True:
+            gelecek = bekleyen.get()
+            if gelecek is None:
+                return
+            if hatalar:
+                continue  # ana döngü tıkanmasın diye kuyruk boşaltılmaya devam eder
+            try:
+                for sonuc in gelecek.result():
+                    cikti.write(sonuc + '\n')
+                if bekleyen.empty():
+                    cikti.flush()
+            except Exception as e:
+                hatalar.append(e)
+
+    with ProcessPoolExecutor(max_workers=isci, initializer=_ag_kur) as havuz:
+        # İşçiler iş parçacıklarından önce başlatılır: fork edilen işçi açılışta stdin'i kapatır
+        # ve okuyucu o sırada stdin kilidini tutuyorsa kilitlenirdi
+        havuz.submit(_parca_isle, []).result()
+        # Okuyucu stdin'de bloklanabilir; hata durumunda sürecin kapanmasını engellemesin
+        threading.Thread(target=okuyucu, daemon=True).start()
+        yazan = threading.Thread(target=yazici, daemon=True)
+        yazan.start()
+        try:
+            bitti = False
+            while not bitti and not hatalar:
+                satir = okunan.get()
+                if satir is None:
+                    break
+                parca = [satir]
+                while len(parca) < parti:
+                    try:
+                        satir = okunan.get_nowait()
+                    except Empty:
+                        break
+                    if satir is None:
+                        bitti = True
+                        break
+                    parca.append(satir)
+                bekleyen.put(havuz.submit(_parca_isle, parca))
+        finally:
+            bekleyen.put(None)
+            yazan.join()
+    if hatalar:
+        raise hatalar[0]
+    cikti.flush()
+
+def main(argv: Optional[Iterable[str]] = None):
+    """Komut satırı giriş noktası."""
+    parser = argparse.ArgumentParser(description="NDJSON toplu rota sorguları")
+    parser.add_argument('girdi', nargs='?', default='-', help="sorgu dosyası (varsayılan: stdin)")
+    parser.add_argument('-o', '--cikti', default='-', help="sonuç dosyası (varsayılan: stdout)")
+    parser.add_argument('--isci', type=int, default=1, help="paralel süreç sayısı")
+    parser.add_argument('--pencere', type=int, default=10000, help="bekleyen (yanıtı yazılmamış) en fazla sorgu")
+    args = parser.parse_args(argv)
+
+    girdi = sys.stdin if args.girdi == '-' else open(args.girdi, encoding='utf-8')
+    cikti = sys.stdout if args.cikti == '-' else open(args.cikti, 'w', encoding='utf-8')
+    try:
+        calistir(girdi, cikti, args.isci, args.pencere)
+    finally:
+        if girdi is not sys.stdin:
+            girdi.close()
+        if cikti is not sys.stdout:
+            cikti.close()
+
+if __name__ == '__main__':
+    main()